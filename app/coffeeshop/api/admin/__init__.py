@@ -3,7 +3,6 @@ import os
 from fastapi import APIRouter, Depends, Request, HTTPException
 from fastapi.security import HTTPBasic, HTTPBasicCredentials
 from fastapi.responses import HTMLResponse
-from fastapi.templating import Jinja2Templates
 import secrets
 
 from ...api.dependencies import get_order_service, get_admin_service
@@ -15,7 +14,6 @@ from .products import router as products_router
 from .orders import router as orders_router
 
 router = APIRouter()
-templates = Jinja2Templates(directory="app/coffeeshop/templates")
 security = HTTPBasic()
 
 def verify_admin(request: Request, credentials: HTTPBasicCredentials = Depends(security)):
@@ -1,12 +1,11 @@
 # app/coffeeshop/api/admin/dashboard.py
 from fastapi import APIRouter, Depends, Request
 from fastapi.responses import HTMLResponse
-from fastapi.templating import Jinja2Templates
 
 from ...api.dependencies import get_order_service, get_admin_service
+from ...infrastructure.static_assets import stylesheet_tags
 
 router = APIRouter()
-templates = Jinja2Templates(directory="app/coffeeshop/templates")
 
 
 @router.get("/", response_class=HTMLResponse)
@@ -28,22 +27,7 @@ async def admin_dashboard(
             <meta charset="UTF-8">
             <meta name="viewport" content="width=device-width, initial-scale=1.0">
             <title>Admin Dashboard - Coffetime</title>
-            <script src="https://cdn.tailwindcss.com"></script>
-            <script>
-                tailwind.config = {{
-                    theme: {{
-                        extend: {{
-                            colors: {{
-                                'coffee-yellow': '#FED728',
-                                'coffee-gray': '#E3E8EF',
-                                'coffee-black': '#0D121C',
-                                'coffee-purple': '#7A5AF8',
-                                'coffee-purple-light': '#EBE9FE'
-                            }}
-                        }}
-                    }}
-                }}
-            </script>
+            {stylesheet_tags()}
         </head>
         <body class="bg-gray-100">
             <div class="min-h-screen">
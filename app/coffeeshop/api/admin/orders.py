@@ -1,12 +1,11 @@
 # app/coffeeshop/api/admin/orders.py
 from fastapi import APIRouter, Depends, Request
 from fastapi.responses import HTMLResponse
-from fastapi.templating import Jinja2Templates
 
 from ...api.dependencies import get_order_service
+from ...infrastructure.static_assets import stylesheet_tags
 
 router = APIRouter()
-templates = Jinja2Templates(directory="app/coffeeshop/templates")
 
 
 @router.get("", response_class=HTMLResponse)
@@ -23,7 +22,7 @@ async def admin_orders(
         <html>
         <head>
             <title>Orders - Admin</title>
-            <script src="https://cdn.tailwindcss.com"></script>
+            {stylesheet_tags()}
         </head>
         <body class="bg-gray-100 p-8">
             <div class="max-w-6xl mx-auto">
@@ -47,7 +46,12 @@ async def admin_orders(
         """
 
         for order in orders:
-            status_color = {"pending": "yellow", "completed": "green", "cancelled": "red"}.get(order.status, "gray")
+            # Full class names, not bg-{color}-100: the CSS build only keeps classes it can find
+            status_classes = {
+                "pending": "bg-yellow-100 text-yellow-800",
+                "completed": "bg-green-100 text-green-800",
+                "cancelled": "bg-red-100 text-red-800"
+            }.get(order.status, "bg-gray-100 text-gray-800")
 
             orders_html += f"""
                             <tr>
@@ -56,7 +60,7 @@ async def admin_orders(
                                 <td class="px-6 py-4 text-sm text-gray-900">{order.ready_time}</td>
                                 <td class="px-6 py-4 text-sm text-gray-900">${order.total_amount:.2f}</td>
                                 <td class="px-6 py-4">
-                                    <span class="inline-flex px-2 py-1 text-xs font-semibold rounded-full bg-{status_color}-100 text-{status_color}-800">
+                                    <span class="inline-flex px-2 py-1 text-xs font-semibold rounded-full {status_classes}">
                                         {order.status.title()}
                                     </span>
                                 </td>
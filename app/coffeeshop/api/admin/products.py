@@ -1,17 +1,22 @@
 # app/coffeeshop/api/admin/products.py
-from fastapi import APIRouter, Depends, Request, Form, UploadFile, File
-from fastapi.responses import HTMLResponse, RedirectResponse
-from fastapi.templating import Jinja2Templates
+from fastapi import APIRouter, Depends, Request, Form
+from fastapi.responses import HTMLResponse, RedirectResponse, JSONResponse
+from starlette.concurrency import run_in_threadpool
 from decimal import Decimal
-from pathlib import Path
-import shutil
-import uuid
+import asyncio
+import logging
 
+from config import settings
 from ...api.dependencies import get_admin_service
 from ...domain.schemas import ProductCreate, ProductSizeCreate
+from ...services.image_service import image_store
+from ...infrastructure.uploads import receive_upload, UploadRejected
+from ...services.image_jobs import submit_product_image, latest_product_image_job, cancel_product_image_jobs
+from ...infrastructure.static_assets import stylesheet_tags
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
-templates = Jinja2Templates(directory="app/coffeeshop/templates")
 
 
 @router.get("", response_class=HTMLResponse)
@@ -32,7 +37,7 @@ async def admin_products(
             <meta charset="UTF-8">
             <meta name="viewport" content="width=device-width, initial-scale=1.0">
             <title>Products - Admin</title>
-            <script src="https://cdn.tailwindcss.com"></script>
+            {stylesheet_tags()}
         </head>
         <body class="bg-gray-100 min-h-screen">
             <div class="max-w-7xl mx-auto p-8">
@@ -332,6 +337,16 @@ async def edit_product_page(
             </div>
             """
 
+        image_job = latest_product_image_job(product_id)
+        image_job_status = ""
+        if image_job is not None:
+            image_job_status = f"""
+            <div id="image-job-status" class="mt-2 text-sm text-gray-600"
+                 data-status="{image_job.status}">
+                New image: {image_job.message} ({image_job.progress}%)
+            </div>
+            """
+
         remove_image_option = ""
         if product.image_path:
             remove_image_option = """
@@ -348,7 +363,7 @@ async def edit_product_page(
             <meta charset="UTF-8">
             <meta name="viewport" content="width=device-width, initial-scale=1.0">
             <title>Edit Product - Admin</title>
-            <script src="https://cdn.tailwindcss.com"></script>
+            {stylesheet_tags()}
         </head>
         <body class="bg-gray-100 min-h-screen">
             <div class="max-w-4xl mx-auto p-8">
@@ -395,6 +410,7 @@ async def edit_product_page(
                                 <div>
                                     <label class="block text-sm font-medium mb-2">Current Image</label>
                                     {image_display}
+                                    {image_job_status}
                                 </div>
 
                                 <!-- Upload New Image -->
@@ -430,6 +446,28 @@ async def edit_product_page(
             </div>
 
             <script>
+                // Poll the background image job until the new image is swapped in
+                (function pollImageJob() {{
+                    const box = document.getElementById('image-job-status');
+                    if (!box || !['queued', 'running'].includes(box.dataset.status)) return;
+
+                    setTimeout(async () => {{
+                        try {{
+                            const response = await fetch('/admin/products/{product_id}/image-job');
+                            const job = await response.json();
+                            box.dataset.status = job.status;
+                            box.textContent = job.error
+                                ? `New image: ${{job.message}} - ${{job.error}}`
+                                : `New image: ${{job.message}} (${{job.progress}}%)`;
+                            if (job.status === 'done') {{
+                                window.location.reload();
+                                return;
+                            }}
+                        }} catch (e) {{}}
+                        pollImageJob();
+                    }}, 1000);
+                }})();
+
                 function togglePriceInput(checkbox, sizeId) {{
                     const priceInput = document.querySelector(`input[name="price_${{sizeId}}"]`);
                     if (checkbox.checked) {{
@@ -454,42 +492,68 @@ async def edit_product_page(
         return HTMLResponse(content=f"<html><body><h1>Error</h1><p>{str(e)}</p></body></html>")
 
 
+@router.get("/{product_id}/image-job")
+async def product_image_job_status(product_id: int):
+    """Status of the latest background image job for a product"""
+    job = latest_product_image_job(product_id)
+    if job is None:
+        return JSONResponse(content={"status": "none", "progress": 0, "message": "No image job", "error": None})
+    return JSONResponse(content=job.to_dict())
+
+
+def _form_flag(value) -> bool:
+    """Checkbox value as a bool, like FastAPI's Form(bool) parsing"""
+    return str(value).lower() in ("1", "true", "on", "yes") if value is not None else False
+
+
 @router.post("/{product_id}/update")
 async def update_product(
     product_id: int,
     request: Request,
-    name: str = Form(...),
-    description: str = Form(""),
-    category_id: int = Form(...),
-    is_active: bool = Form(False),
-    remove_image: bool = Form(False),
-    image: UploadFile = File(None),
     admin_service = Depends(get_admin_service)
 ):
-    """Update product"""
-    try:
-        form_data = await request.form()
+    """Update product.
 
-        # Handle image upload
-        image_path = None
-        if image and image.filename:
-            # Create upload directory if it doesn't exist
-            upload_dir = Path("app/coffeeshop/static/images/products")
-            upload_dir.mkdir(parents=True, exist_ok=True)
-
-            # Generate unique filename
-            file_extension = Path(image.filename).suffix.lower()
-            if file_extension not in ['.jpg', '.jpeg', '.png', '.gif', '.webp']:
-                file_extension = '.jpg'
+    The form is parsed here rather than via Form()/File() parameters so the
+    image streams straight to disk, size-limited and checked by content.
+    """
+    upload = None
+    try:
+        try:
+            form_data, upload = await receive_upload(
+                request, "image", image_store.staging_dir, settings.max_file_size
+            )
+        except UploadRejected as e:
+            return HTMLResponse(content=f"""
+            <html><body style='padding: 20px; font-family: Arial;'>
+                <h1>Error</h1>
+                <p>Image rejected: {str(e)}</p>
+                <a href='/admin/products/{product_id}/edit'>Back to Product</a>
+            </body></html>
+            """, status_code=e.status_code)
 
-            unique_filename = f"{uuid.uuid4()}{file_extension}"
-            file_path = upload_dir / unique_filename
+        name = form_data.get("name")
+        category_id = int(form_data.get("category_id"))
+        description = form_data.get("description", "")
+        is_active = _form_flag(form_data.get("is_active"))
+        remove_image = _form_flag(form_data.get("remove_image"))
+        if not name:
+            raise ValueError("Product name is required")
 
-            # Save file
-            with open(file_path, "wb") as buffer:
-                shutil.copyfileobj(image.file, buffer)
+        # Get current product to manage image and sizes
+        current_products = await admin_service.get_all_products()
+        current_product = next((p for p in current_products if p.id == product_id), None)
 
-            image_path = f"/static/images/products/{unique_filename}"
+        # Handle image upload
+        image_path = None
+        image_job = None
+        if upload is not None:
+            # Stored under its content hash; identical bytes are not kept twice
+            image_path, created = await run_in_threadpool(
+                image_store.adopt, upload.path, upload.digest, upload.size, upload.extension
+            )
+            if not created and current_product and current_product.image_path == image_path:
+                image_path = None
 
         # Update basic product info
         update_data = {
@@ -500,20 +564,33 @@ async def update_product(
         }
 
         # Handle image update
+        reused_variants = []
         if remove_image:
             update_data["image_path"] = None
+            cancel_product_image_jobs(product_id)
         elif image_path:
-            update_data["image_path"] = image_path
+            reused_variants = await admin_service.find_image_variants(image_path)
+
+        if image_path and not remove_image and not reused_variants:
+            # Derivatives are built in the background; the job swaps image_path when ready
+            try:
+                image_job = submit_product_image(product_id, str(image_store.local_path(image_path)), image_path)
+            except (asyncio.QueueFull, RuntimeError) as e:
+                logger.warning(f"Image queue unavailable ({e}), using the original upload for product {product_id}")
+                update_data["image_path"] = image_path
 
         await admin_service.update_product(product_id, **update_data)
 
+        if reused_variants:
+            # Same file already processed for another product
+            cancel_product_image_jobs(product_id)
+            await admin_service.swap_product_image(product_id, image_path, reused_variants)
+        elif remove_image or (image_path and image_job is None):
+            await admin_service.set_image_variants(product_id, None, [])
+
         # Update sizes and prices
         size_ids = form_data.getlist("sizes")
 
-        # Get current product to manage sizes
-        current_products = await admin_service.get_all_products()
-        current_product = next((p for p in current_products if p.id == product_id), None)
-
         if current_product:
             # Deactivate sizes that are no longer selected
             for ps in current_product.product_sizes:
@@ -533,9 +610,15 @@ async def update_product(
                 except (ValueError, TypeError):
                     continue
 
+        if image_job is not None:
+            # Back to the edit page, which shows the processing status
+            return RedirectResponse(url=f"/admin/products/{product_id}/edit", status_code=303)
+
         return RedirectResponse(url="/admin/products", status_code=303)
 
     except Exception as e:
+        if upload is not None:
+            upload.discard()
         return HTMLResponse(content=f"""
         <html><body style='padding: 20px; font-family: Arial;'>
             <h1>Error</h1>
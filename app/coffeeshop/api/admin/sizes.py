@@ -1,13 +1,12 @@
 # app/coffeeshop/api/admin/sizes.py
 from fastapi import APIRouter, Depends, Request, Form
 from fastapi.responses import HTMLResponse, RedirectResponse
-from fastapi.templating import Jinja2Templates
 
 from ...api.dependencies import get_admin_service
 from ...domain.schemas import SizeCreate
+from ...infrastructure.static_assets import stylesheet_tags
 
 router = APIRouter()
-templates = Jinja2Templates(directory="app/coffeeshop/templates")
 
 
 @router.get("", response_class=HTMLResponse)
@@ -26,22 +25,7 @@ async def admin_sizes(
             <meta charset="UTF-8">
             <meta name="viewport" content="width=device-width, initial-scale=1.0">
             <title>Sizes - Admin</title>
-            <script src="https://cdn.tailwindcss.com"></script>
-            <script>
-                tailwind.config = {{
-                    theme: {{
-                        extend: {{
-                            colors: {{
-                                'coffee-yellow': '#FED728',
-                                'coffee-gray': '#E3E8EF',
-                                'coffee-black': '#0D121C',
-                                'coffee-purple': '#7A5AF8',
-                                'coffee-purple-light': '#EBE9FE'
-                            }}
-                        }}
-                    }}
-                }}
-            </script>
+            {stylesheet_tags()}
         </head>
         <body class="bg-gray-100 min-h-screen">
             <!-- Header -->
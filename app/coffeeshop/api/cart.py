@@ -1,16 +1,15 @@
 # app/coffeeshop/api/cart.py
 from fastapi import APIRouter, Depends, Request, Response, Form, HTTPException
 from fastapi.responses import HTMLResponse
-from fastapi.templating import Jinja2Templates
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..infrastructure.database import get_db_session
 from ..services.session_cart_service import SessionCartService
 
 router = APIRouter()
-templates = Jinja2Templates(directory="app/coffeeshop/templates")
 
 from ..api.dependencies import get_session_cart_service
+from ..infrastructure.templating import templates
 
 
 @router.get("", response_class=HTMLResponse)
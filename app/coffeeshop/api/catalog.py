@@ -1,39 +1,28 @@
 # app/coffeeshop/api/catalog.py
 from fastapi import APIRouter, Depends, Request, HTTPException
-from fastapi.responses import HTMLResponse
-from fastapi.templating import Jinja2Templates
+from fastapi.responses import HTMLResponse, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
+import json
 import logging
 
+from config import settings
 from ..infrastructure.database import get_db_session
+from ..infrastructure.cache import VersionedLRUCache
 from ..services.product_service import ProductService
 from ..services.category_service import CategoryService
+from ..services.catalog_snapshot import catalog_store
 from ..api.dependencies import get_product_service, get_category_service
+from ..api.http_cache import catalog_etag, etag_matches, set_etag, not_modified, encoded_response, revalidate
+from ..infrastructure.compression import EncodedBody
+from ..infrastructure.templating import templates
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
-templates = Jinja2Templates(directory="app/coffeeshop/templates")
 
 
-@router.get("/catalog/products", response_class=HTMLResponse)
-async def get_products(
-    request: Request,
-    category: Optional[str] = None,
-    q: Optional[str] = None,
-    product_service: ProductService = Depends(get_product_service)
-):
-    try:
-        if q and q.strip():
-            products = await product_service.search_products(q.strip())
-        elif category and category != "All":
-            products = await product_service.get_products_by_category(category)
-        else:
-            products = await product_service.get_active_products()
-
-        if not products:
-            return HTMLResponse("""
+NO_PRODUCTS_HTML = """
             <div class="text-center py-12">
                 <div class="w-24 h-24 mx-auto mb-4 bg-coffee-gray rounded-full flex items-center justify-center">
                     <svg class="w-12 h-12 text-gray-400" fill="none" stroke="currentColor" viewBox="0 0 24 24">
@@ -42,16 +31,65 @@ async def get_products(
                 </div>
                 <p class="text-gray-500">No products available</p>
             </div>
-            """)
+            """
 
-        return templates.TemplateResponse(
-            "partials/product_list.html",
-            {
-                "request": request,
-                "products": products,
-                "search_query": q
-            }
-        )
+fragment_cache = VersionedLRUCache(maxsize=settings.fragment_cache_size)
+suggest_cache = VersionedLRUCache(maxsize=settings.suggest_cache_size)
+# Root page for visitors with an empty cart (rendered in main.root)
+page_cache = VersionedLRUCache(maxsize=2)
+
+
+def normalize_query(q: Optional[str]) -> str:
+    """Collapse whitespace and case so equivalent searches share a cache entry"""
+    return " ".join(q.split()).casefold() if q else ""
+
+
+def render_fragment(template_name: str, context: dict) -> bytes:
+    return templates.get_template(template_name).render(context).encode("utf-8")
+
+
+@router.get("/catalog/products", response_class=HTMLResponse)
+async def get_products(
+    request: Request,
+    category: Optional[str] = None,
+    q: Optional[str] = None,
+    product_service: ProductService = Depends(get_product_service)
+):
+    try:
+        query = normalize_query(q)
+        snapshot = await catalog_store.get_snapshot()
+        etag = catalog_etag(snapshot.version, "products", category, query)
+        not_modified_response = revalidate(request, etag, catalog_version=catalog_store.version_tag(snapshot.version))
+        if not_modified_response is not None:
+            return not_modified_response
+
+        cache_key = ("products", category, query)
+        encoded = fragment_cache.get(snapshot.version, cache_key)
+
+        if encoded is None:
+            if query:
+                products = await product_service.search_products(query, snapshot=snapshot)
+            elif category and category != "All":
+                products = await product_service.get_products_by_category(category, snapshot=snapshot)
+            else:
+                products = await product_service.get_active_products(snapshot=snapshot)
+
+            if not products:
+                body = NO_PRODUCTS_HTML.encode("utf-8")
+            else:
+                body = render_fragment(
+                    "partials/product_list.html",
+                    {
+                        "request": request,
+                        "products": products,
+                        "search_query": query
+                    }
+                )
+
+            encoded = EncodedBody.encode(body)
+            fragment_cache.set(snapshot.version, cache_key, encoded)
+
+        return encoded_response(request, encoded, etag, catalog_version=catalog_store.version_tag(snapshot.version))
 
     except Exception as e:
         return HTMLResponse(f"""
@@ -68,19 +106,33 @@ async def get_categories(
     category_service: CategoryService = Depends(get_category_service)
 ):
     try:
-        categories = await category_service.get_active_categories()
+        snapshot = await catalog_store.get_snapshot()
+        etag = catalog_etag(snapshot.version, "categories")
+        not_modified_response = revalidate(request, etag, catalog_version=catalog_store.version_tag(snapshot.version))
+        if not_modified_response is not None:
+            return not_modified_response
 
-        all_categories = [{"name": "All", "slug": "all"}] + [
-            {"name": cat.name, "slug": cat.slug} for cat in categories
-        ]
+        cache_key = ("categories",)
+        encoded = fragment_cache.get(snapshot.version, cache_key)
 
-        return templates.TemplateResponse(
-            "partials/category_filters.html",
-            {
-                "request": request,
-                "categories": all_categories
-            }
-        )
+        if encoded is None:
+            categories = await category_service.get_active_categories(snapshot=snapshot)
+
+            all_categories = [{"name": "All", "slug": "all"}] + [
+                {"name": cat.name, "slug": cat.slug} for cat in categories
+            ]
+
+            body = render_fragment(
+                "partials/category_filters.html",
+                {
+                    "request": request,
+                    "categories": all_categories
+                }
+            )
+            encoded = EncodedBody.encode(body)
+            fragment_cache.set(snapshot.version, cache_key, encoded)
+
+        return encoded_response(request, encoded, etag, catalog_version=catalog_store.version_tag(snapshot.version))
 
     except Exception as e:
         return HTMLResponse(f'<div class="text-red-500">Error loading categories: {str(e)}</div>')
@@ -93,18 +145,32 @@ async def get_products_by_category_slug(
     product_service: ProductService = Depends(get_product_service)
 ):
     try:
-        if category_slug == "all":
-            products = await product_service.get_active_products()
-        else:
-            products = await product_service.get_products_by_category_slug(category_slug)
+        snapshot = await catalog_store.get_snapshot()
+        etag = catalog_etag(snapshot.version, "category", category_slug)
+        not_modified_response = revalidate(request, etag, catalog_version=catalog_store.version_tag(snapshot.version))
+        if not_modified_response is not None:
+            return not_modified_response
 
-        return templates.TemplateResponse(
-            "partials/product_list.html",
-            {
-                "request": request,
-                "products": products
-            }
-        )
+        cache_key = ("category", category_slug)
+        encoded = fragment_cache.get(snapshot.version, cache_key)
+
+        if encoded is None:
+            if category_slug == "all":
+                products = await product_service.get_active_products(snapshot=snapshot)
+            else:
+                products = await product_service.get_products_by_category_slug(category_slug, snapshot=snapshot)
+
+            body = render_fragment(
+                "partials/product_list.html",
+                {
+                    "request": request,
+                    "products": products
+                }
+            )
+            encoded = EncodedBody.encode(body)
+            fragment_cache.set(snapshot.version, cache_key, encoded)
+
+        return encoded_response(request, encoded, etag, catalog_version=catalog_store.version_tag(snapshot.version))
 
     except Exception as e:
         return HTMLResponse(f'<div class="text-red-500">Error: {str(e)}</div>')
@@ -117,23 +183,72 @@ async def search_products(
     product_service: ProductService = Depends(get_product_service)
 ):
     try:
-        if q.strip():
-            products = await product_service.search_products(q)
-        else:
-            products = await product_service.get_active_products()
+        query = normalize_query(q)
+        snapshot = await catalog_store.get_snapshot()
+        etag = catalog_etag(snapshot.version, "search", query)
+        not_modified_response = revalidate(request, etag, catalog_version=catalog_store.version_tag(snapshot.version))
+        if not_modified_response is not None:
+            return not_modified_response
 
-        return templates.TemplateResponse(
-            "partials/product_list.html",
-            {
-                "request": request,
-                "products": products,
-                "search_query": q
-            }
-        )
+        cache_key = ("search", query)
+        encoded = fragment_cache.get(snapshot.version, cache_key)
+
+        if encoded is None:
+            if query:
+                products = await product_service.search_products(query, snapshot=snapshot)
+            else:
+                products = await product_service.get_active_products(snapshot=snapshot)
+
+            body = render_fragment(
+                "partials/product_list.html",
+                {
+                    "request": request,
+                    "products": products,
+                    "search_query": query
+                }
+            )
+            encoded = EncodedBody.encode(body)
+            fragment_cache.set(snapshot.version, cache_key, encoded)
+
+        return encoded_response(request, encoded, etag, catalog_version=catalog_store.version_tag(snapshot.version))
 
     except Exception as e:
         return HTMLResponse(f'<div class="text-red-500">Error: {str(e)}</div>')
 
+@router.get("/catalog/suggest")
+async def suggest_products(
+    request: Request,
+    q: str = "",
+    limit: int = 8,
+    product_service: ProductService = Depends(get_product_service)
+):
+    """Search-as-you-type suggestions: id, name and min price only"""
+    try:
+        limit = max(1, min(limit, 20))
+        query = normalize_query(q)
+        snapshot = await catalog_store.get_snapshot()
+        etag = catalog_etag(snapshot.version, "suggest", query, limit)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+
+        cache_key = (query, limit)
+        body = suggest_cache.get(snapshot.version, cache_key)
+
+        if body is None:
+            suggestions = await product_service.suggest(query, limit=limit, snapshot=snapshot)
+            body = json.dumps(
+                [suggestion.to_dict() for suggestion in suggestions],
+                ensure_ascii=False
+            ).encode("utf-8")
+            suggest_cache.set(snapshot.version, cache_key, body)
+
+        return set_etag(Response(content=body, media_type="application/json"), etag)
+
+    except Exception as e:
+        logger.error(f"Error building suggestions: {str(e)}")
+        return Response(content=b"[]", media_type="application/json")
+
+
 @router.get("/product/{product_id}", response_class=HTMLResponse)
 async def get_product_detail(
     product_id: int,
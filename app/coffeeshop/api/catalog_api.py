@@ -0,0 +1,155 @@
+# app/coffeeshop/api/catalog_api.py
+from fastapi import APIRouter, Request
+from fastapi.responses import Response, JSONResponse
+from typing import Optional
+import logging
+
+from ..infrastructure.cache import VersionedLRUCache
+from ..infrastructure.serialization import dumps, to_minor_units
+from ..services.catalog_snapshot import CatalogSnapshot, CatalogChange, catalog_store
+from ..api.http_cache import catalog_etag, etag_matches, set_etag, not_modified, CATALOG_VERSION_HEADER
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+# Encoded documents, one per snapshot version
+document_cache = VersionedLRUCache(maxsize=64)
+
+# Prices are integer minor units: 350 with exponent 2 means 3.50
+PRICE_EXPONENT = 2
+
+
+def category_entry(category) -> dict:
+    return {"id": category.id, "name": category.name, "slug": category.slug}
+
+
+def size_entry(size) -> dict:
+    return {"id": size.id, "name": size.name, "volume": size.volume, "unit": size.unit}
+
+
+def product_entry(product) -> dict:
+    return {
+        "id": product.id,
+        "name": product.name,
+        "slug": product.slug,
+        "description": product.description or "",
+        "image_path": product.image_path,
+        "category_id": product.category_id,
+        "sizes": [
+            {
+                "id": ps.id,
+                "size_id": ps.size_id,
+                "price": to_minor_units(ps.price, PRICE_EXPONENT)
+            }
+            for ps in product.product_sizes
+        ]
+    }
+
+
+def build_catalog_document(snapshot: CatalogSnapshot) -> dict:
+    """Compact, normalized menu: sizes are listed once and referenced by id"""
+    return {
+        "version": snapshot.version,
+        "epoch": catalog_store.epoch,
+        "full": True,
+        "price_exponent": PRICE_EXPONENT,
+        "categories": [category_entry(category) for category in snapshot.categories],
+        "sizes": [size_entry(size) for size in snapshot.sizes_by_id.values()],
+        "products": [product_entry(product) for product in snapshot.products]
+    }
+
+
+def build_changes_document(snapshot: CatalogSnapshot, since: int, change: CatalogChange) -> dict:
+    """Upserts for rows still in the snapshot, ids for rows that left it"""
+    categories = {category.id: category for category in snapshot.categories}
+    sizes = snapshot.sizes_by_id
+
+    return {
+        "version": snapshot.version,
+        "epoch": catalog_store.epoch,
+        "full": False,
+        "since": since,
+        "price_exponent": PRICE_EXPONENT,
+        "categories": [category_entry(categories[i]) for i in sorted(change.categories) if i in categories],
+        "sizes": [size_entry(sizes[i]) for i in sorted(change.sizes) if i in sizes],
+        "products": [
+            product_entry(snapshot.products_by_id[i])
+            for i in sorted(change.products) if i in snapshot.products_by_id
+        ],
+        "removed": {
+            "categories": sorted(i for i in change.categories if i not in categories),
+            "sizes": sorted(i for i in change.sizes if i not in sizes),
+            "products": sorted(i for i in change.products if i not in snapshot.products_by_id)
+        }
+    }
+
+
+def json_response(body: bytes, snapshot: CatalogSnapshot, etag: str) -> Response:
+    response = Response(content=body, media_type="application/json")
+    response.headers[CATALOG_VERSION_HEADER] = catalog_store.version_tag(snapshot.version)
+    return set_etag(response, etag)
+
+
+@router.get("/catalog")
+async def get_catalog(request: Request):
+    """Full menu as compact JSON, versioned and revalidated with an ETag"""
+    try:
+        snapshot = await catalog_store.get_snapshot()
+        etag = catalog_etag(snapshot.version, "api", "catalog")
+        if etag_matches(request, etag):
+            return not_modified(etag)
+
+        body = document_cache.get(snapshot.version, "catalog")
+        if body is None:
+            body = dumps(build_catalog_document(snapshot))
+            document_cache.set(snapshot.version, "catalog", body)
+
+        return json_response(body, snapshot, etag)
+
+    except Exception as e:
+        logger.error(f"Catalog API error: {e}")
+        return JSONResponse(
+            status_code=500,
+            content={"success": False, "error": "Catalog unavailable"}
+        )
+
+
+@router.get("/catalog/changes")
+async def get_catalog_changes(request: Request, since: int = 0, epoch: Optional[str] = None):
+    """Delta since a version the client already has; the full catalog if the log cannot cover it"""
+    try:
+        snapshot = await catalog_store.get_snapshot()
+
+        # Versions restart with every process: a delta is only safe for a
+        # client that names the epoch its version came from
+        change = None
+        if epoch is not None and epoch == catalog_store.epoch:
+            change = catalog_store.changes_since(since)
+
+        if change is None:
+            cache_key = "catalog"
+            etag = catalog_etag(snapshot.version, "api", "catalog")
+        else:
+            cache_key = ("changes", since)
+            etag = catalog_etag(snapshot.version, "api", "changes", since)
+
+        if etag_matches(request, etag):
+            return not_modified(etag)
+
+        body = document_cache.get(snapshot.version, cache_key)
+        if body is None:
+            if change is None:
+                body = dumps(build_catalog_document(snapshot))
+            else:
+                body = dumps(build_changes_document(snapshot, since, change))
+            document_cache.set(snapshot.version, cache_key, body)
+
+        return json_response(body, snapshot, etag)
+
+    except Exception as e:
+        logger.error(f"Catalog changes API error: {e}")
+        return JSONResponse(
+            status_code=500,
+            content={"success": False, "error": "Catalog unavailable"}
+        )
@@ -8,19 +8,19 @@ from ..services.category_service import CategoryService
 from ..services.session_cart_service import SessionCartService  # Новый импорт
 
 
-async def get_product_service(db: AsyncSession = Depends(get_db_session)) -> ProductService:
-    """Dependency to get product service"""
-    return ProductService(db)
+async def get_product_service() -> ProductService:
+    """Dependency to get product service (snapshot-backed, no DB session needed)"""
+    return ProductService()
 
 
-async def get_category_service(db: AsyncSession = Depends(get_db_session)) -> CategoryService:
-    """Dependency to get category service"""
-    return CategoryService(db)
+async def get_category_service() -> CategoryService:
+    """Dependency to get category service (snapshot-backed, no DB session needed)"""
+    return CategoryService()
 
 
-async def get_session_cart_service(db: AsyncSession = Depends(get_db_session)) -> SessionCartService:
-    """Dependency to get session cart service"""
-    return SessionCartService(db)
+async def get_session_cart_service() -> SessionCartService:
+    """Dependency to get session cart service (snapshot-priced, no DB session needed)"""
+    return SessionCartService()
 
 
 async def get_order_service(db: AsyncSession = Depends(get_db_session)):
@@ -62,6 +62,19 @@ async def detailed_health_check(db: AsyncSession = Depends(get_db_session)):
             "error": str(e)
         }
 
+    # Rendered fragment and typeahead caches
+    from .catalog import fragment_cache, suggest_cache, page_cache
+    health_status["checks"]["fragment_cache"] = fragment_cache.stats()
+    health_status["checks"]["suggest_cache"] = suggest_cache.stats()
+    health_status["checks"]["page_cache"] = page_cache.stats()
+
+    # Snapshot builds and how many callers shared them
+    from ..services.catalog_snapshot import catalog_store
+    health_status["checks"]["catalog_snapshot"] = catalog_store.stats()
+
+    from ..services.image_jobs import image_queue
+    health_status["checks"]["image_queue"] = image_queue.stats()
+
     # Return appropriate status
     if health_status["status"] == "unhealthy":
         raise HTTPException(status_code=503, detail=health_status)
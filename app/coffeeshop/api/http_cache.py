@@ -0,0 +1,100 @@
+# app/coffeeshop/api/http_cache.py
+import hashlib
+import uuid
+from typing import Optional
+from fastapi import Request, Response
+
+from ..infrastructure.compression import EncodedBody, negotiate_encoding, variant_etag
+
+# Every representation encoded_response can serve, each with its own ETag
+ENCODINGS = ("identity", "gzip", "br")
+
+# Changes on every process start, so fragments rendered by a previous
+# deploy (possibly with different templates) never validate.
+BUILD_TOKEN = uuid.uuid4().hex[:8]
+
+# Lets clients (the service worker) tell which catalog version a response shows,
+# as "<epoch>-<version>" (CatalogStore.version_tag)
+CATALOG_VERSION_HEADER = "X-Catalog-Version"
+
+
+def catalog_etag(version: int, *parts) -> str:
+    """Strong ETag for a response derived from the catalog version and request parameters"""
+    key = ":".join([BUILD_TOKEN, str(version)] + ["" if part is None else str(part) for part in parts])
+    return f'"{hashlib.sha1(key.encode("utf-8")).hexdigest()[:24]}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Check If-None-Match against an ETag (weak comparison, as RFC 9110 requires for GET)"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+
+    if header.strip() == "*":
+        return True
+
+    # nginx downgrades ETags to weak ones when it gzips a response
+    return any(tag.strip().removeprefix("W/") == etag for tag in header.split(","))
+
+
+def set_etag(response: Response, etag: str) -> Response:
+    """Attach validator headers so clients revalidate instead of refetching"""
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "no-cache"
+    return response
+
+
+def not_modified(etag: str) -> Response:
+    """Empty 304 response for a matching If-None-Match"""
+    return set_etag(Response(status_code=304), etag)
+
+
+def revalidate(
+    request: Request,
+    etag: str,
+    vary: str = "Accept-Encoding",
+    catalog_version: Optional[str] = None
+) -> Optional[Response]:
+    """304 if the client holds any encoding of this response, before anything is rendered.
+
+    encoded_response validates too, but only after the body has been built;
+    handlers call this first so a matching revalidation costs no cache lookup,
+    rendering or compression.
+    """
+    if not request.headers.get("if-none-match"):
+        return None
+
+    for encoding in ENCODINGS:
+        candidate = variant_etag(etag, encoding)
+        if etag_matches(request, candidate):
+            response = not_modified(candidate)
+            response.headers["Vary"] = vary
+            if catalog_version is not None:
+                response.headers[CATALOG_VERSION_HEADER] = catalog_version
+            return response
+    return None
+
+
+def encoded_response(
+    request: Request,
+    body: EncodedBody,
+    etag: str,
+    media_type: str = "text/html; charset=utf-8",
+    vary: str = "Accept-Encoding",
+    catalog_version: Optional[str] = None
+) -> Response:
+    """Serve the precompressed variant the client accepts, revalidated per variant"""
+    encoding = negotiate_encoding(request.headers.get("accept-encoding"), body.available())
+    etag = variant_etag(etag, encoding)
+
+    if etag_matches(request, etag):
+        response = not_modified(etag)
+    else:
+        response = set_etag(Response(content=body.variant(encoding), media_type=media_type), etag)
+        if encoding != "identity":
+            response.headers["Content-Encoding"] = encoding
+
+    response.headers["Vary"] = vary
+    if catalog_version is not None:
+        response.headers[CATALOG_VERSION_HEADER] = catalog_version
+    return response
@@ -1,7 +1,6 @@
 # app/coffeeshop/api/orders.py
 from fastapi import APIRouter, Depends, Request, Response, Form, HTTPException
 from fastapi.responses import HTMLResponse
-from fastapi.templating import Jinja2Templates
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..infrastructure.database import get_db_session
@@ -9,9 +8,9 @@ from ..services.session_cart_service import SessionCartService
 from ..api.dependencies import get_order_service
 
 router = APIRouter()
-templates = Jinja2Templates(directory="app/coffeeshop/templates")
 
 from ..api.dependencies import get_session_cart_service, get_order_service
+from ..infrastructure.templating import templates
 
 
 @router.get("/checkout", response_class=HTMLResponse)
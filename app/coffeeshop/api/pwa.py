@@ -0,0 +1,83 @@
+# app/coffeeshop/api/pwa.py
+import fnmatch
+import hashlib
+import os
+from typing import List
+
+from fastapi import APIRouter, Request
+
+from config import settings
+from ..infrastructure.compression import EncodedBody
+from ..infrastructure.static_assets import static_manifest, static_url
+from ..infrastructure.templating import templates, TEMPLATES_DIR
+from ..api.http_cache import encoded_response
+
+router = APIRouter()
+
+STATIC_DIR = "app/coffeeshop/static"
+
+# Small assets every page needs; splash screens and screenshots are too big to precache
+PRECACHE_PATTERNS = (
+    "css/*",
+    "js/*",
+    "images/icon-192.png",
+    "images/icon-512.png",
+    "images/apple-touch-icon.png",
+    "images/favicon-*.png",
+)
+
+# (deploy version, EncodedBody) of the last render
+_rendered = {}
+
+
+def precache_paths() -> List[str]:
+    """Paths under static/ to precache, from the build manifest or the source tree"""
+    paths = list(static_manifest.files)
+    if not paths:
+        paths = [
+            os.path.relpath(os.path.join(root, name), STATIC_DIR).replace(os.sep, "/")
+            for root, _, names in os.walk(STATIC_DIR)
+            for name in names
+        ]
+    return sorted(path for path in paths if any(fnmatch.fnmatch(path, pattern) for pattern in PRECACHE_PATTERNS))
+
+
+def deploy_version() -> str:
+    """Changes whenever static files or templates change, i.e. on every deploy that matters"""
+    sha = hashlib.sha256(static_manifest.version.encode())
+    for root, _, names in sorted(os.walk(TEMPLATES_DIR)):
+        for name in sorted(names):
+            with open(os.path.join(root, name), "rb") as f:
+                sha.update(name.encode())
+                sha.update(f.read())
+    return sha.hexdigest()[:12]
+
+
+def _service_worker() -> tuple:
+    if _rendered and not settings.debug:
+        return _rendered["version"], _rendered["body"]
+
+    version = deploy_version()
+    if _rendered.get("version") != version:
+        body = templates.get_template("service-worker.js").render({
+            "deploy_version": version,
+            "precache_urls": [static_url(path) for path in precache_paths()],
+            "static_build_url": settings.static_build_url
+        }).encode("utf-8")
+        _rendered.update(version=version, body=EncodedBody.encode(body))
+    return _rendered["version"], _rendered["body"]
+
+
+@router.get("/service-worker.js")
+async def service_worker(request: Request):
+    """Service worker rendered with this deploy's precache list and cache names.
+
+    Served from the root so it can control the whole site; no-cache so
+    browsers revalidate it on every update check.
+    """
+    version, body = _service_worker()
+    response = encoded_response(
+        request, body, f'"sw-{version}"', media_type="application/javascript; charset=utf-8"
+    )
+    response.headers["Service-Worker-Allowed"] = "/"
+    return response
@@ -54,6 +54,31 @@ class Product(Base):
     # Relationships
     category = relationship("Category", back_populates="products")
     product_sizes = relationship("ProductSize", back_populates="product", cascade="all, delete-orphan")
+    image_variants = relationship(
+        "ProductImageVariant",
+        back_populates="product",
+        cascade="all, delete-orphan",
+        lazy="selectin",
+        order_by="ProductImageVariant.width"
+    )
+
+
+class ProductImageVariant(Base):
+    __tablename__ = "product_image_variants"
+
+    id = Column(Integer, primary_key=True, index=True)
+    product_id = Column(Integer, ForeignKey("products.id"), nullable=False, index=True)
+    source_path = Column(String(500), nullable=False)  # Product.image_path it was derived from
+    name = Column(String(20), nullable=False)  # card, card@2x, detail, detail@2x
+    format = Column(String(10), nullable=False)  # webp, jpeg
+    width = Column(Integer, nullable=False)
+    height = Column(Integer, nullable=False)
+    path = Column(String(500), nullable=False)
+    size_bytes = Column(Integer, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    # Relationships
+    product = relationship("Product", back_populates="image_variants")
 
 
 class ProductSize(Base):
@@ -95,6 +95,21 @@ class ProductUpdate(BaseModel):
     is_active: Optional[bool] = None
 
 
+class ProductImageVariant(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    product_id: int
+    source_path: str
+    name: str
+    format: str
+    width: int
+    height: int
+    path: str
+    size_bytes: int
+    created_at: Optional[datetime] = None
+
+
 class Product(ProductBase):
     model_config = ConfigDict(from_attributes=True)
 
@@ -103,9 +118,27 @@ class Product(ProductBase):
     image_path: Optional[str] = None
     category: Category
     product_sizes: List[ProductSize] = []
+    image_variants: List[ProductImageVariant] = []
     created_at: datetime
     updated_at: Optional[datetime] = None
 
+    def current_image_variants(self, format: str) -> List[ProductImageVariant]:
+        """Derivatives of the current image in one format, narrowest first"""
+        return [
+            variant for variant in self.image_variants
+            if variant.format == format and variant.source_path == self.image_path
+        ]
+
+    def image_srcset(self, format: str) -> str:
+        return ", ".join(f"{variant.path} {variant.width}w" for variant in self.current_image_variants(format))
+
+    def image_fallback(self, name: str = "detail") -> Optional[str]:
+        """JPEG derivative to use as <img src>, or the original upload"""
+        for variant in self.current_image_variants("jpeg"):
+            if variant.name == name:
+                return variant.path
+        return self.image_path
+
 
 class CartItemBase(BaseModel):
     product_size_id: int
@@ -192,3 +225,75 @@ class CartItem(CartItemBase):
 class CartItemWithImage(CartItem):
     """Расширенная версия CartItem с обязательным изображением"""
     image_path: Optional[str] = None
+
+
+# Trusted construction from ORM rows.
+# Rows loaded from our own database already satisfy these schemas, so the
+# catalog snapshot builds read models with model_construct instead
+# of re-validating every nested Category/ProductSize/Size on each rebuild.
+
+_CATEGORY_FIELDS = tuple(Category.model_fields)
+_SIZE_FIELDS = tuple(Size.model_fields)
+_PRODUCT_SIZE_FIELDS = tuple(name for name in ProductSize.model_fields if name != "size")
+_IMAGE_VARIANT_FIELDS = tuple(ProductImageVariant.model_fields)
+_PRODUCT_FIELDS = tuple(
+    name for name in Product.model_fields if name not in ("category", "product_sizes", "image_variants")
+)
+
+
+def _construct(model, values: dict):
+    # values always holds every field, so they are all explicitly set
+    return model.model_construct(_fields_set=set(values), **values)
+
+
+def _orm_values(row, names) -> dict:
+    # Loaded column values live in the instance __dict__; reading them there
+    # skips SQLAlchemy's attribute instrumentation. Anything not loaded yet
+    # falls back to normal attribute access.
+    state = row.__dict__
+    return {name: state[name] if name in state else getattr(row, name) for name in names}
+
+
+def category_from_orm(row) -> Category:
+    return _construct(Category, _orm_values(row, _CATEGORY_FIELDS))
+
+
+def size_from_orm(row) -> Size:
+    return _construct(Size, _orm_values(row, _SIZE_FIELDS))
+
+
+def product_size_from_orm(row, size: Optional[Size] = None) -> ProductSize:
+    values = _orm_values(row, _PRODUCT_SIZE_FIELDS)
+    values["size"] = size if size is not None else size_from_orm(row.size)
+    return _construct(ProductSize, values)
+
+
+def image_variant_from_orm(row) -> ProductImageVariant:
+    return _construct(ProductImageVariant, _orm_values(row, _IMAGE_VARIANT_FIELDS))
+
+
+def product_from_orm(row, categories: Optional[dict] = None, sizes: Optional[dict] = None) -> Product:
+    """Build a Product read model without validation.
+
+    categories and sizes are optional id -> schema memo dicts, so rows that
+    share a category or size also share one read model instance.
+    """
+    categories = {} if categories is None else categories
+    sizes = {} if sizes is None else sizes
+
+    category = categories.get(row.category_id)
+    if category is None:
+        category = categories[row.category_id] = category_from_orm(row.category)
+
+    product_sizes = []
+    for ps in row.product_sizes:
+        size = sizes.get(ps.size_id)
+        if size is None:
+            size = sizes[ps.size_id] = size_from_orm(ps.size)
+        product_sizes.append(product_size_from_orm(ps, size))
+
+    values = _orm_values(row, _PRODUCT_FIELDS)
+    values["category"] = category
+    values["product_sizes"] = product_sizes
+    values["image_variants"] = [image_variant_from_orm(variant) for variant in row.image_variants]
+    return _construct(Product, values)
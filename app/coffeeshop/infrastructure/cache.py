@@ -0,0 +1,58 @@
+# app/coffeeshop/infrastructure/cache.py
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+
+class VersionedLRUCache:
+    """Size-bounded LRU cache that empties itself when the catalog version changes"""
+
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._version: Optional[int] = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _sync_version(self, version: int):
+        if version != self._version:
+            self.evictions += len(self._data)
+            self._data.clear()
+            self._version = version
+
+    def get(self, version: int, key: Hashable) -> Optional[Any]:
+        self._sync_version(version)
+
+        value = self._data.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, version: int, key: Hashable, value: Any):
+        self._sync_version(version)
+
+        self._data[key] = value
+        self._data.move_to_end(key)
+
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        self._data.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "version": self._version,
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0
+        }
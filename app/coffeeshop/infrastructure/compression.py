@@ -0,0 +1,89 @@
+# app/coffeeshop/infrastructure/compression.py
+import gzip
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli is optional at runtime
+    brotli = None
+
+# Cached bodies are compressed once per catalog version, so spend the CPU
+GZIP_LEVEL = 9
+BROTLI_QUALITY = 9
+
+# Below this the encoding overhead outweighs the saving
+MIN_COMPRESS_SIZE = 1024
+
+# Preference when the client weighs encodings equally
+ENCODING_PREFERENCE = ("br", "gzip")
+
+
+@dataclass(frozen=True)
+class EncodedBody:
+    """Raw response bytes with their precomputed compressed variants"""
+
+    identity: bytes
+    gzip: Optional[bytes] = None
+    br: Optional[bytes] = None
+
+    @classmethod
+    def encode(cls, body: bytes) -> "EncodedBody":
+        if len(body) < MIN_COMPRESS_SIZE:
+            return cls(body)
+
+        return cls(
+            identity=body,
+            gzip=gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0),
+            br=brotli.compress(body, quality=BROTLI_QUALITY) if brotli is not None else None
+        )
+
+    def variant(self, encoding: str) -> bytes:
+        return getattr(self, encoding) if encoding != "identity" else self.identity
+
+    def available(self) -> tuple:
+        return tuple(encoding for encoding in ENCODING_PREFERENCE if getattr(self, encoding) is not None)
+
+
+def parse_accept_encoding(header: str) -> Dict[str, float]:
+    """Map each coding in an Accept-Encoding header to its q-value"""
+    weights: Dict[str, float] = {}
+    for part in header.split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[coding] = q
+    return weights
+
+
+def negotiate_encoding(header: Optional[str], available: tuple) -> str:
+    """Pick the best available content coding the client accepts, else identity"""
+    if not header or not available:
+        return "identity"
+
+    weights = parse_accept_encoding(header)
+    wildcard = weights.get("*", 0.0)
+
+    best, best_q = "identity", 0.0
+    for encoding in available:
+        q = weights.get(encoding, wildcard)
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def variant_etag(etag: str, encoding: str) -> str:
+    """Distinct strong ETag per representation, as each encoding has different bytes"""
+    if encoding == "identity":
+        return etag
+    suffix = "gz" if encoding == "gzip" else encoding
+    return f'"{etag.strip(chr(34))}-{suffix}"'
@@ -0,0 +1,142 @@
+# app/coffeeshop/infrastructure/image_store.py
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class ImageStore:
+    """Content-addressed image files with a manifest.
+
+    Files are named by the SHA-256 of their bytes (objects/ab/abcd...jpg),
+    so a URL always means the same content and can be cached forever, and
+    identical uploads share one file. The manifest records each object's
+    size and derived files; it lives outside the public directory. What is
+    still in use is decided from the database (services/image_gc.py).
+
+    Every method reads or rewrites the manifest file: call them from a
+    worker thread, not the event loop.
+    """
+
+    def __init__(self, root: Path, url_prefix: str, manifest_path: Path):
+        self.root = Path(root)
+        self.url_prefix = url_prefix.rstrip("/")
+        self.manifest_path = Path(manifest_path)
+        # Uploads hash and write in worker threads
+        self._lock = threading.RLock()
+
+    # Paths and URLs
+
+    def relative_path(self, digest: str, extension: str) -> str:
+        return f"{digest[:2]}/{digest}{extension}"
+
+    def path_for(self, digest: str, extension: str) -> Path:
+        return self.root / self.relative_path(digest, extension)
+
+    def url_for(self, digest: str, extension: str) -> str:
+        return f"{self.url_prefix}/{self.relative_path(digest, extension)}"
+
+    def digest_from_url(self, url: Optional[str]) -> Optional[str]:
+        """Digest of a stored object URL, or None for anything else (e.g. legacy uploads)"""
+        if not url or not url.startswith(self.url_prefix + "/"):
+            return None
+        name = url.rsplit("/", 1)[-1]
+        digest = name.split(".", 1)[0]
+        return digest if len(digest) == 64 else None
+
+    def local_path(self, url: str) -> Optional[Path]:
+        digest = self.digest_from_url(url)
+        if digest is None:
+            return None
+        return self.root / url[len(self.url_prefix) + 1:]
+
+    # Manifest
+
+    def _load(self) -> Dict[str, dict]:
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    def _save(self, manifest: Dict[str, dict]):
+        self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.manifest_path.parent, prefix=".manifest-", suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=1, sort_keys=True)
+        os.replace(tmp, self.manifest_path)
+
+    def manifest(self) -> Dict[str, dict]:
+        with self._lock:
+            return self._load()
+
+    def lookup(self, digest: str) -> Optional[dict]:
+        with self._lock:
+            return self._load().get(digest)
+
+    # Writing
+
+    @property
+    def staging_dir(self) -> Path:
+        """Where uploads are streamed before adoption; same filesystem, so adopting is a rename"""
+        return self.root / ".incoming"
+
+    def adopt(self, staged_path: Path, digest: str, size: int, extension: str) -> Tuple[str, bool]:
+        """Move a fully written, hashed upload into the store; returns (url, created).
+
+        If the content is already stored the staged file is just deleted,
+        so identical bytes never replace or duplicate an object.
+        """
+        with self._lock:
+            manifest = self._load()
+            entry = manifest.get(digest)
+            if entry is not None and (self.root / entry["path"]).exists():
+                os.unlink(staged_path)
+                # Reused content counts as fresh for the orphan collector's grace period
+                os.utime(self.root / entry["path"])
+                return f"{self.url_prefix}/{entry['path']}", False
+
+            path = self.path_for(digest, extension)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(staged_path, path)
+            os.chmod(path, 0o644)
+
+            manifest[digest] = {
+                "path": self.relative_path(digest, extension),
+                "size": size,
+                "derivatives": entry.get("derivatives", []) if entry else [],
+                "created_at": time.time()
+            }
+            self._save(manifest)
+            return self.url_for(digest, extension), True
+
+    # Bookkeeping
+
+    def forget(self, digests: Iterable[str]):
+        """Drop manifest entries for objects deleted from disk"""
+        with self._lock:
+            manifest = self._load()
+            for digest in digests:
+                manifest.pop(digest, None)
+            self._save(manifest)
+
+    def record_derivatives(self, url: str, derivative_urls: Iterable[str]):
+        digest = self.digest_from_url(url)
+        if digest is None:
+            return
+
+        with self._lock:
+            manifest = self._load()
+            entry = manifest.get(digest)
+            if entry is None:
+                return
+            prefix = self.url_prefix + "/"
+            names = {u[len(prefix):] for u in derivative_urls if u.startswith(prefix)}
+            entry["derivatives"] = sorted(set(entry.get("derivatives", [])) | names)
+            self._save(manifest)
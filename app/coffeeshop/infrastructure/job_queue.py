@@ -0,0 +1,189 @@
+# app/coffeeshop/infrastructure/job_queue.py
+import asyncio
+import logging
+import multiprocessing
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+QUEUED, RUNNING, DONE, FAILED, SUPERSEDED = "queued", "running", "done", "failed", "superseded"
+
+
+@dataclass
+class Job:
+    """One unit of background work and its progress, as shown to admins"""
+
+    id: str
+    kind: str
+    key: Hashable
+    status: str = QUEUED
+    progress: int = 0
+    message: str = "Waiting for a worker"
+    error: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (DONE, FAILED, SUPERSEDED)
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "key": self.key,
+            "status": self.status,
+            "progress": self.progress,
+            "message": self.message,
+            "error": self.error,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at
+        }
+
+
+@dataclass
+class _Task:
+    job: Job
+    fn: Callable
+    args: tuple
+    on_result: Callable[[Job, Any], Awaitable[None]]
+
+
+class JobQueue:
+    """Bounded queue that runs CPU-heavy functions in a process pool.
+
+    fn runs in a worker process, so it must be a picklable module-level
+    function; on_result then runs back on the event loop to apply the result.
+    """
+
+    def __init__(self, name: str, max_workers: int = 2, max_pending: int = 16, history: int = 200):
+        self.name = name
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.history = history
+        self._queue: Optional[asyncio.Queue] = None
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._workers: List[asyncio.Task] = []
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._latest: Dict[tuple, Job] = {}
+        self.completed = 0
+        self.failed = 0
+
+    @property
+    def running(self) -> bool:
+        return self._pool is not None
+
+    def start(self):
+        if self.running:
+            return
+        self._pool = self._new_pool()
+        self._queue = asyncio.Queue(maxsize=self.max_pending)
+        self._workers = [asyncio.ensure_future(self._worker()) for _ in range(self.max_workers)]
+        logger.info(f"Job queue '{self.name}' started with {self.max_workers} workers")
+
+    def _new_pool(self) -> ProcessPoolExecutor:
+        # spawn: forking a process that already runs an event loop and DB threads is unsafe
+        return ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+
+    async def stop(self):
+        if not self.running:
+            return
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        self._pool = None
+        self._queue = None
+        self._workers = []
+
+    def submit(
+        self,
+        kind: str,
+        key: Hashable,
+        fn: Callable,
+        args: tuple,
+        on_result: Callable[[Job, Any], Awaitable[None]]
+    ) -> Job:
+        """Queue fn(*args); raises RuntimeError if not started, asyncio.QueueFull if saturated"""
+        if not self.running:
+            raise RuntimeError(f"Job queue '{self.name}' is not running")
+
+        job = Job(id=uuid.uuid4().hex[:12], kind=kind, key=key)
+        self._queue.put_nowait(_Task(job, fn, args, on_result))
+
+        self._jobs[job.id] = job
+        self._latest[(kind, key)] = job
+        while len(self._jobs) > self.history:
+            self._jobs.popitem(last=False)
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    def latest(self, kind: str, key: Hashable) -> Optional[Job]:
+        """Most recently submitted job for a key (e.g. the product being edited)"""
+        return self._latest.get((kind, key))
+
+    def forget(self, kind: str, key: Hashable):
+        """Supersede any job still running for key, e.g. when its target was removed"""
+        self._latest.pop((kind, key), None)
+
+    def is_latest(self, job: Job) -> bool:
+        return self._latest.get((job.kind, job.key)) is job
+
+    async def _worker(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            task = await self._queue.get()
+            job = task.job
+            try:
+                job.status, job.progress, job.message = RUNNING, 10, "Processing"
+                job.started_at = time.time()
+
+                result = await loop.run_in_executor(self._pool, task.fn, *task.args)
+
+                job.progress, job.message = 80, "Saving"
+                await task.on_result(job, result)
+
+                if job.status == RUNNING:
+                    job.status, job.progress, job.message = DONE, 100, "Done"
+                self.completed += 1
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                job.status, job.message, job.error = FAILED, "Failed", str(e) or type(e).__name__
+                self.failed += 1
+                logger.error(f"Job {job.id} ({job.kind} {job.key}) failed: {e}")
+
+                if isinstance(e, BrokenProcessPool) and self._pool is not None:
+                    # A crashed worker (e.g. OOM on a huge image) breaks the whole pool
+                    logger.warning(f"Job queue '{self.name}': restarting broken process pool")
+                    broken, self._pool = self._pool, self._new_pool()
+                    broken.shutdown(wait=False, cancel_futures=True)
+
+            finally:
+                job.finished_at = time.time() if job.finished else job.finished_at
+                self._queue.task_done()
+
+    def stats(self) -> dict:
+        return {
+            "name": self.name,
+            "running": self.running,
+            "workers": self.max_workers,
+            "pending": self._queue.qsize() if self._queue else 0,
+            "max_pending": self.max_pending,
+            "completed": self.completed,
+            "failed": self.failed
+        }
@@ -0,0 +1,22 @@
+# app/coffeeshop/infrastructure/serialization.py
+import json
+from decimal import Decimal, ROUND_HALF_UP
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional at runtime
+    orjson = None
+
+JSON_ENCODER = "orjson" if orjson is not None else "json"
+
+
+def dumps(data) -> bytes:
+    """Compact JSON bytes, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def to_minor_units(amount: Decimal, exponent: int = 2) -> int:
+    """Convert a money amount to integer minor units (cents), rounding half up"""
+    return int((Decimal(amount) * (10 ** exponent)).quantize(Decimal("1"), rounding=ROUND_HALF_UP))
@@ -0,0 +1,104 @@
+# app/coffeeshop/infrastructure/static_assets.py
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Dict, Optional
+
+from markupsafe import Markup
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+STATIC_URL = "/static"
+STATIC_DIR = Path("app/coffeeshop/static")
+# Written by build_static.py next to the fingerprinted files
+MANIFEST_NAME = "staticfiles.json"
+
+# Purged Tailwind output, compiled by build_static.py from tailwind.config.js
+STYLESHEET = "css/app.css"
+
+# Only used before the first build, so a fresh checkout still renders styled pages;
+# the colors mirror tailwind.config.js
+TAILWIND_DEV_FALLBACK = """<script src="https://cdn.tailwindcss.com"></script>
+<script>
+    tailwind.config = {theme: {extend: {colors: {
+        'coffee-yellow': '#FED728',
+        'coffee-gray': '#E3E8EF',
+        'coffee-black': '#0D121C',
+        'coffee-purple': '#7A5AF8',
+        'coffee-purple-light': '#EBE9FE'
+    }}}}
+</script>"""
+
+
+class StaticManifest:
+    """Maps source paths under static/ to their fingerprinted build copies.
+
+    Without a build (local development) every path resolves to the plain
+    /static URL, so templates work either way.
+    """
+
+    def __init__(self, path: Path, build_url: str, reload: bool = False):
+        self.path = Path(path)
+        self.build_url = build_url.rstrip("/")
+        self.reload = reload
+        self._files: Optional[Dict[str, str]] = None
+        self._version = "dev"
+        self._mtime = None
+
+    def load(self):
+        try:
+            mtime = os.stat(self.path).st_mtime
+        except FileNotFoundError:
+            self._files, self._version, self._mtime = {}, "dev", None
+            return
+
+        if mtime == self._mtime and self._files is not None:
+            return
+        with open(self.path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        self._files, self._version, self._mtime = data.get("files", {}), data.get("version", "dev"), mtime
+        logger.info(f"Loaded static manifest {self._version} ({len(self._files)} files)")
+
+    def _ensure_loaded(self):
+        if self._files is None or self.reload:
+            self.load()
+
+    @property
+    def version(self) -> str:
+        """Hash over all built files; 'dev' without a build"""
+        self._ensure_loaded()
+        return self._version
+
+    @property
+    def files(self) -> Dict[str, str]:
+        self._ensure_loaded()
+        return self._files
+
+    def url(self, path: str) -> str:
+        path = path.lstrip("/")
+        built = self.files.get(path)
+        if built is None:
+            return f"{STATIC_URL}/{path}"
+        return f"{self.build_url}/{built}"
+
+
+static_manifest = StaticManifest(
+    Path(settings.static_build_dir) / MANIFEST_NAME,
+    settings.static_build_url,
+    reload=settings.debug
+)
+
+
+def static_url(path: str) -> str:
+    """URL for a file under static/: fingerprinted when built, plain /static otherwise"""
+    return static_manifest.url(path)
+
+
+def stylesheet_tags() -> Markup:
+    """<link> to the compiled stylesheet, shared by templates and the admin pages"""
+    if STYLESHEET not in static_manifest.files and not (STATIC_DIR / STYLESHEET).exists():
+        return Markup(TAILWIND_DEV_FALLBACK)
+    return Markup(f'<link rel="stylesheet" href="{static_url(STYLESHEET)}">')
@@ -0,0 +1,83 @@
+# app/coffeeshop/infrastructure/static_files.py
+import mimetypes
+import os
+from typing import Tuple
+
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import Scope
+
+from .compression import negotiate_encoding
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+class CachingStaticFiles(StaticFiles):
+    """StaticFiles that marks content-addressed paths as cacheable forever.
+
+    Files under immutable_paths are named by their content hash, so a
+    changed file always gets a new URL and browsers never need to revalidate.
+    """
+
+    def __init__(self, *args, immutable_paths: Tuple[str, ...] = (), **kwargs):
+        super().__init__(*args, **kwargs)
+        self.immutable_paths = tuple(os.path.normpath(path) + os.sep for path in immutable_paths)
+
+    def file_response(
+        self,
+        full_path,
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200
+    ) -> Response:
+        response = super().file_response(full_path, stat_result, scope, status_code)
+        if self.get_path(scope).startswith(self.immutable_paths):
+            response.headers["Cache-Control"] = IMMUTABLE_CACHE_CONTROL
+        return response
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """Serves build_static.py output: fingerprinted, so cached forever, and
+    using the .br/.gz sibling of a file when the client accepts it.
+    """
+
+    SIBLINGS = (("br", ".br"), ("gzip", ".gz"))
+
+    def file_response(
+        self,
+        full_path,
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200
+    ) -> Response:
+        request_headers = Headers(scope=scope)
+        full_path = str(full_path)
+
+        available = {}
+        for encoding, extension in self.SIBLINGS:
+            try:
+                available[encoding] = (full_path + extension, os.stat(full_path + extension))
+            except FileNotFoundError:
+                continue
+
+        encoding = negotiate_encoding(request_headers.get("accept-encoding"), tuple(available))
+        if encoding == "identity":
+            response = FileResponse(full_path, status_code=status_code, stat_result=stat_result)
+        else:
+            path, sibling_stat = available[encoding]
+            response = FileResponse(
+                path,
+                status_code=status_code,
+                stat_result=sibling_stat,
+                media_type=mimetypes.guess_type(full_path)[0] or "application/octet-stream",
+                headers={"Content-Encoding": encoding}
+            )
+
+        if available:
+            response.headers["Vary"] = "Accept-Encoding"
+        response.headers["Cache-Control"] = IMMUTABLE_CACHE_CONTROL
+
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
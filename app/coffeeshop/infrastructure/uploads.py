@@ -0,0 +1,236 @@
+# app/coffeeshop/infrastructure/uploads.py
+import hashlib
+import os
+import tempfile
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from fastapi import Request
+from python_multipart import MultipartParser
+from python_multipart.multipart import parse_options_header
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import FormData
+
+# Non-file form fields are short strings (names, prices, checkboxes)
+MAX_FIELD_SIZE = 64 * 1024
+# Multipart framing and the text fields on top of the file itself
+FORM_OVERHEAD = 256 * 1024
+# Without a Content-Length only these bound the rest of the form
+MAX_PARTS = 64
+MAX_FIELDS_SIZE = FORM_OVERHEAD
+
+# Bytes needed to recognise every accepted format
+SNIFF_SIZE = 12
+
+
+class UploadRejected(Exception):
+    """Upload refused while streaming; status_code says why (400 or 413)"""
+
+    def __init__(self, message: str, status_code: int = 400):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def sniff_image_extension(head: bytes) -> Optional[str]:
+    """File extension for the image format in the first bytes, or None if not an accepted image"""
+    if head.startswith(b"\xff\xd8\xff"):
+        return ".jpg"
+    if head.startswith(b"\x89PNG\r\n\x1a\n"):
+        return ".png"
+    if head.startswith((b"GIF87a", b"GIF89a")):
+        return ".gif"
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return ".webp"
+    return None
+
+
+@dataclass
+class StagedUpload:
+    """An uploaded file already on disk under a temporary name, with its hash and size"""
+
+    filename: str
+    path: Path
+    extension: str
+    digest: str
+    size: int
+
+    def discard(self):
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+
+
+@dataclass
+class _FilePart:
+    filename: str
+    staging_dir: Path
+    max_size: int
+    head: bytearray = field(default_factory=bytearray)
+    extension: Optional[str] = None
+    size: int = 0
+    sha: object = field(default_factory=hashlib.sha256)
+    file: Optional[object] = None
+    path: Optional[Path] = None
+
+    def _open(self):
+        self.staging_dir.mkdir(parents=True, exist_ok=True)
+        fd, name = tempfile.mkstemp(dir=self.staging_dir, prefix=".upload-")
+        self.file, self.path = os.fdopen(fd, "wb"), Path(name)
+
+    def write(self, data: bytes):
+        """Blocking: runs in a worker thread"""
+        if self.file is None:
+            self._open()
+        self.sha.update(data)
+        self.file.write(data)
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+
+    def abort(self):
+        self.close()
+        if self.path is not None and self.path.exists():
+            os.unlink(self.path)
+
+
+async def receive_upload(
+    request: Request,
+    file_field: str,
+    staging_dir: Path,
+    max_file_size: int
+) -> Tuple[FormData, Optional[StagedUpload]]:
+    """Parse a multipart form in one streaming pass, staging one image file to disk.
+
+    The file goes to disk chunk by chunk from a worker thread, hashed on
+    the way, so memory stays flat and the event loop never blocks. It is
+    refused from its first bytes if they are not a known image format, and
+    as soon as it passes max_file_size. Returns the text fields and the
+    staged file (None if no file was sent).
+    """
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > max_file_size + FORM_OVERHEAD:
+        raise UploadRejected(f"Upload exceeds the {max_file_size // (1024 * 1024)} MB limit", 413)
+
+    content_type, params = parse_options_header(request.headers.get("content-type", ""))
+    if content_type != b"multipart/form-data":
+        # A urlencoded form cannot carry a file
+        return await request.form(), None
+    boundary = params.get(b"boundary")
+    if not boundary:
+        raise UploadRejected("Missing boundary in multipart form")
+
+    fields: List[Tuple[str, str]] = []
+    current = {"name": None, "headers": {}, "header": b"", "value": b"", "data": bytearray(), "file": None}
+    pending: List[tuple] = []
+    staged: List[_FilePart] = []
+    totals = {"parts": 0, "text": 0}
+
+    def on_part_begin():
+        totals["parts"] += 1
+        if totals["parts"] > MAX_PARTS:
+            raise UploadRejected("Too many form fields", 413)
+        current.update(name=None, headers={}, data=bytearray(), file=None)
+
+    def on_header_field(data, start, end):
+        current["header"] += data[start:end]
+        if len(current["header"]) > MAX_FIELD_SIZE:
+            raise UploadRejected("Form part header is too large", 413)
+
+    def on_header_value(data, start, end):
+        current["value"] += data[start:end]
+        if len(current["value"]) > MAX_FIELD_SIZE:
+            raise UploadRejected("Form part header is too large", 413)
+
+    def on_header_end():
+        current["headers"][current["header"].lower()] = current["value"]
+        current["header"], current["value"] = b"", b""
+
+    def on_headers_finished():
+        _, options = parse_options_header(current["headers"].get(b"content-disposition", b""))
+        current["name"] = options.get(b"name", b"").decode("utf-8", "replace")
+        if b"filename" in options:
+            filename = options[b"filename"].decode("utf-8", "replace")
+            # Browsers send an empty file part when nothing was chosen
+            if current["name"] == file_field and filename and not staged:
+                current["file"] = _FilePart(filename, staging_dir, max_file_size)
+                staged.append(current["file"])
+            else:
+                current["file"] = False
+
+    def on_part_data(data, start, end):
+        chunk = data[start:end]
+        part = current["file"]
+        if part is False:
+            return
+        if part is None:
+            if len(current["data"]) + len(chunk) > MAX_FIELD_SIZE:
+                raise UploadRejected(f"Form field '{current['name']}' is too large", 413)
+            totals["text"] += len(chunk)
+            if totals["text"] > MAX_FIELDS_SIZE:
+                raise UploadRejected("Form fields are too large", 413)
+            current["data"].extend(chunk)
+            return
+
+        part.size += len(chunk)
+        if part.size > part.max_size:
+            raise UploadRejected(f"Image exceeds the {part.max_size // (1024 * 1024)} MB limit", 413)
+
+        if part.extension is None:
+            # Hold the first bytes back until the format can be recognised
+            part.head.extend(chunk)
+            if len(part.head) < SNIFF_SIZE:
+                return
+            part.extension = sniff_image_extension(bytes(part.head))
+            if part.extension is None:
+                raise UploadRejected("Only JPEG, PNG, GIF and WebP images are accepted")
+            chunk, part.head = bytes(part.head), bytearray()
+        pending.append((part, chunk))
+
+    def on_part_end():
+        part = current["file"]
+        if part is None:
+            fields.append((current["name"], current["data"].decode("utf-8", "replace")))
+        elif part is not False and part.extension is None and part.head:
+            # Files shorter than SNIFF_SIZE
+            part.extension = sniff_image_extension(bytes(part.head))
+            if part.extension is None:
+                raise UploadRejected("Only JPEG, PNG, GIF and WebP images are accepted")
+            pending.append((part, bytes(part.head)))
+
+    parser = MultipartParser(boundary, {
+        "on_part_begin": on_part_begin,
+        "on_part_data": on_part_data,
+        "on_part_end": on_part_end,
+        "on_header_field": on_header_field,
+        "on_header_value": on_header_value,
+        "on_header_end": on_header_end,
+        "on_headers_finished": on_headers_finished
+    })
+
+    async def flush():
+        # Callbacks are synchronous; do the file writes off the event loop after each chunk
+        for part, data in pending:
+            await run_in_threadpool(part.write, data)
+        pending.clear()
+
+    try:
+        async for chunk in request.stream():
+            parser.write(chunk)
+            await flush()
+        parser.finalize()
+        await flush()
+        for part in staged:
+            await run_in_threadpool(part.close)
+    except BaseException:
+        for part in staged:
+            await run_in_threadpool(part.abort)
+        raise
+
+    if not staged or staged[0].path is None:
+        return FormData(fields), None
+
+    part = staged[0]
+    return FormData(fields), StagedUpload(part.filename, part.path, part.extension, part.sha.hexdigest(), part.size)
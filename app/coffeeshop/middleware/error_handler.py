@@ -2,10 +2,9 @@
 import logging
 from fastapi import Request, HTTPException
 from fastapi.responses import HTMLResponse, JSONResponse
-from fastapi.templating import Jinja2Templates
+from ..infrastructure.templating import templates
 
 logger = logging.getLogger("errors")
-templates = Jinja2Templates(directory="app/coffeeshop/templates")
 
 
 async def http_error_handler(request: Request, exc: HTTPException):
@@ -5,7 +5,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, and_
 from sqlalchemy.orm import selectinload, joinedload
 
-from ..domain.models import Product, Category, ProductSize, Size
+from ..domain.models import Product, Category, ProductSize, Size, ProductImageVariant
 from ..domain.schemas import (
     Product as ProductSchema,
     Category as CategorySchema,
@@ -15,6 +15,7 @@ from ..domain.schemas import (
     SizeCreate
 )
 from ..infrastructure.database import create_slug
+from .catalog_snapshot import catalog_store, CatalogChange
 
 
 class AdminService:
@@ -23,6 +24,10 @@ class AdminService:
     def __init__(self, db: AsyncSession):
         self.db = db
 
+    async def _catalog_changed(self, products=(), sizes=(), categories=()):
+        """Schedule a catalog snapshot rebuild after a committed write, logging what it touched"""
+        catalog_store.invalidate(CatalogChange.of(products, sizes, categories))
+
     # Categories management
     async def get_all_categories(self) -> List[CategorySchema]:
         """Get all categories (including inactive)"""
@@ -43,6 +48,7 @@ class AdminService:
         self.db.add(category)
         await self.db.commit()
         await self.db.refresh(category)
+        await self._catalog_changed(categories=[category.id])
 
         return CategorySchema.model_validate(category)
 
@@ -63,6 +69,7 @@ class AdminService:
 
         await self.db.commit()
         await self.db.refresh(category)
+        await self._catalog_changed(categories=[category_id])
 
         return CategorySchema.model_validate(category)
 
@@ -77,6 +84,7 @@ class AdminService:
 
         category.is_active = False
         await self.db.commit()
+        await self._catalog_changed(categories=[category_id])
         return True
 
     # Sizes management
@@ -99,6 +107,7 @@ class AdminService:
         self.db.add(size)
         await self.db.commit()
         await self.db.refresh(size)
+        await self._catalog_changed(sizes=[size.id])
 
         return SizeSchema.model_validate(size)
 
@@ -142,6 +151,7 @@ class AdminService:
 
         await self.db.commit()
         await self.db.refresh(product)
+        await self._catalog_changed(products=[product.id])
 
         # Return with relationships
         query = (
@@ -174,13 +184,15 @@ class AdminService:
             return None
 
         for key, value in updates.items():
-            if hasattr(product, key) and value is not None:
+            # image_path=None is an explicit removal
+            if hasattr(product, key) and (value is not None or key == 'image_path'):
                 if key == 'name':
                     product.slug = create_slug(value)
                 setattr(product, key, value)
 
         await self.db.commit()
         await self.db.refresh(product)
+        await self._catalog_changed(products=[product_id])
 
         return ProductSchema.model_validate(product)
 
@@ -195,8 +207,58 @@ class AdminService:
 
         product.is_active = False
         await self.db.commit()
+        await self._catalog_changed(products=[product_id])
+        return True
+
+    async def _replace_image_variants(self, product_id: int, source_path: Optional[str], variants: List[dict]):
+        query = select(ProductImageVariant).where(ProductImageVariant.product_id == product_id)
+        result = await self.db.execute(query)
+        for variant in result.scalars().all():
+            await self.db.delete(variant)
+
+        if source_path:
+            for variant in variants:
+                self.db.add(ProductImageVariant(product_id=product_id, source_path=source_path, **variant))
+
+    async def set_image_variants(self, product_id: int, source_path: Optional[str], variants: List[dict]) -> bool:
+        """Replace the recorded image derivatives of a product"""
+        await self._replace_image_variants(product_id, source_path, variants)
+        await self.db.commit()
+        await self._catalog_changed(products=[product_id])
+        return True
+
+    async def swap_product_image(self, product_id: int, image_path: str, variants: List[dict]) -> bool:
+        """Point a product at a new image and its derivatives in one transaction"""
+        query = select(Product).where(Product.id == product_id)
+        result = await self.db.execute(query)
+        product = result.scalar_one_or_none()
+
+        if not product:
+            return False
+
+        product.image_path = image_path
+        await self._replace_image_variants(product_id, image_path, variants)
+        await self.db.commit()
+        await self._catalog_changed(products=[product_id])
         return True
 
+    async def find_image_variants(self, source_path: str) -> List[dict]:
+        """Derivatives already built for an image, e.g. when another product uses the same file"""
+        query = select(ProductImageVariant).where(ProductImageVariant.source_path == source_path)
+        result = await self.db.execute(query)
+
+        variants = {}
+        for variant in result.scalars().all():
+            variants[(variant.name, variant.format)] = {
+                "name": variant.name,
+                "format": variant.format,
+                "width": variant.width,
+                "height": variant.height,
+                "path": variant.path,
+                "size_bytes": variant.size_bytes
+            }
+        return list(variants.values())
+
     async def update_product_size_price(self, product_id: int, size_id: int, price: Decimal) -> bool:
         """Update product size price"""
         query = select(ProductSize).where(
@@ -213,6 +275,7 @@ class AdminService:
 
         product_size.price = price
         await self.db.commit()
+        await self._catalog_changed(products=[product_id])
         return True
 
     async def update_or_create_product_size(self, product_id: int, size_id: int, price: Decimal) -> bool:
@@ -241,6 +304,7 @@ class AdminService:
             self.db.add(product_size)
 
         await self.db.commit()
+        await self._catalog_changed(products=[product_id])
         return True
 
     async def deactivate_product_size(self, product_id: int, size_id: int) -> bool:
@@ -257,6 +321,7 @@ class AdminService:
         if product_size:
             product_size.is_active = False
             await self.db.commit()
+            await self._catalog_changed(products=[product_id])
             return True
         return False
 
@@ -275,5 +340,6 @@ class AdminService:
 
         await self.db.commit()
         await self.db.refresh(size)
+        await self._catalog_changed(sizes=[size_id])
 
         return SizeSchema.model_validate(size)
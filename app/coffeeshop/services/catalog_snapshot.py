@@ -0,0 +1,479 @@
+# app/coffeeshop/services/catalog_snapshot.py
+import asyncio
+import hashlib
+import json
+import logging
+import time
+import uuid
+from collections import deque
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import Deque, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload, joinedload
+
+from ..domain.models import Product, Category, ProductSize, Size
+from ..domain.schemas import (
+    Product as ProductSchema,
+    Category as CategorySchema,
+    Size as SizeSchema,
+    category_from_orm,
+    product_from_orm,
+    size_from_orm
+)
+from config import settings
+from ..infrastructure.database import async_session_factory
+from .search_index import SearchIndex, PrefixTrie
+from .single_flight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+ALL_CATEGORY = {"name": "All", "slug": "all", "id": 0}
+ALL_CATEGORIES_JSON = '[{"name": "All", "slug": "all", "id": 0}]'
+
+
+def _product_to_dict(product: ProductSchema) -> dict:
+    """Frontend representation of a product embedded in layout.html"""
+    return {
+        "id": product.id,
+        "name": product.name or "",
+        "description": product.description or "",
+        "image_path": product.image_path,
+        "image_srcset": {
+            "webp": product.image_srcset("webp"),
+            "jpeg": product.image_srcset("jpeg")
+        },
+        "category": {
+            "id": product.category.id,
+            "name": product.category.name,
+            "slug": product.category.slug
+        },
+        "product_sizes": [
+            {
+                "id": ps.id,
+                "price": float(ps.price),
+                "size": {
+                    "id": ps.size.id,
+                    "name": ps.size.name,
+                    "volume": ps.size.volume,
+                    "unit": ps.size.unit
+                }
+            }
+            for ps in product.product_sizes
+        ]
+    }
+
+
+def _content_digest(
+    products: List[ProductSchema],
+    categories: List[CategorySchema],
+    sizes: List[SizeSchema],
+    prices: Dict[int, "PriceEntry"]
+) -> str:
+    """Fingerprint of everything the snapshot is built from"""
+    content = {
+        "products": [product.model_dump(mode="json") for product in products],
+        "categories": [category.model_dump(mode="json") for category in categories],
+        "sizes": [size.model_dump(mode="json") for size in sizes],
+        "prices": [
+            [product_size_id, entry.product_name, entry.size_name, str(entry.price), entry.image_path, entry.is_active]
+            for product_size_id, entry in sorted(prices.items())
+        ]
+    }
+    return hashlib.sha256(json.dumps(content, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def _embeddable_json(data) -> str:
+    """Serialize data for a <script type="application/json"> block"""
+    return json.dumps(data, ensure_ascii=False).replace("</", "<\\/")
+
+
+@dataclass(frozen=True)
+class PriceEntry:
+    """What the cart needs to know about one product size"""
+
+    product_name: str
+    size_name: str
+    price: Decimal
+    image_path: Optional[str]
+    is_active: bool
+
+
+@dataclass(frozen=True)
+class CatalogSnapshot:
+    """Immutable, pre-resolved view of the active menu"""
+
+    version: int
+    digest: str = ""
+    products: Tuple[ProductSchema, ...] = ()
+    categories: Tuple[CategorySchema, ...] = ()
+    products_by_id: Dict[int, ProductSchema] = field(default_factory=dict)
+    products_by_category_name: Dict[str, Tuple[ProductSchema, ...]] = field(default_factory=dict)
+    products_by_category_slug: Dict[str, Tuple[ProductSchema, ...]] = field(default_factory=dict)
+    categories_by_slug: Dict[str, CategorySchema] = field(default_factory=dict)
+    # Active sizes plus any a listed product still uses
+    sizes_by_id: Dict[int, SizeSchema] = field(default_factory=dict)
+    products_json: str = "[]"
+    categories_json: str = ALL_CATEGORIES_JSON
+    search_index: SearchIndex = field(default_factory=lambda: SearchIndex(()))
+    suggest_trie: PrefixTrie = field(default_factory=lambda: PrefixTrie((), ()))
+    # Every product size, including inactive ones: carts may still hold them
+    prices: Dict[int, PriceEntry] = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class CatalogChange:
+    """Ids of catalog rows touched by a write (or by several, once merged)"""
+
+    products: FrozenSet[int] = frozenset()
+    sizes: FrozenSet[int] = frozenset()
+    categories: FrozenSet[int] = frozenset()
+
+    @classmethod
+    def of(
+        cls,
+        products: Iterable[int] = (),
+        sizes: Iterable[int] = (),
+        categories: Iterable[int] = ()
+    ) -> "CatalogChange":
+        return cls(frozenset(products), frozenset(sizes), frozenset(categories))
+
+    def merge(self, other: "CatalogChange") -> "CatalogChange":
+        return CatalogChange(
+            self.products | other.products,
+            self.sizes | other.sizes,
+            self.categories | other.categories
+        )
+
+
+class CatalogStore:
+    """Holds the current catalog snapshot and swaps it atomically on rebuild.
+
+    Reads follow stale-while-revalidate: once a snapshot is invalidated by a
+    write, or is older than max_staleness, readers keep getting it while one
+    background task rebuilds. Only past hard_expiry do readers wait for the
+    rebuild, and even then a failed rebuild falls back to the stale snapshot.
+    """
+
+    # Seconds between background attempts after a failed rebuild
+    RETRY_DELAY = 5.0
+
+    def __init__(
+        self,
+        change_log_size: int = 500,
+        max_staleness: float = 60.0,
+        hard_expiry: float = 600.0
+    ):
+        self._snapshot: Optional[CatalogSnapshot] = None
+        self._version = 0
+        self.max_staleness = max_staleness
+        self.hard_expiry = hard_expiry
+        # Concurrent builds (cold start, bursts of admin writes) share one run
+        self.flight = SingleFlight("catalog_snapshot")
+        # Writes waiting for a rebuild, and how far builds have caught up with them
+        self._pending_changes: List[Optional[CatalogChange]] = []
+        self._requested = 0
+        self._built = 0
+        # Monotonic time the current snapshot was last confirmed against the database
+        self._validated_at = 0.0
+        self._last_failure_at: Optional[float] = None
+        self._background: Set[asyncio.Task] = set()
+        # Versions restart with the process; clients compare the epoch before
+        # trusting a version number they remembered
+        self.epoch = uuid.uuid4().hex[:8]
+        self._change_log: Deque[Tuple[int, CatalogChange]] = deque()
+        self._change_log_size = change_log_size
+        # Oldest version the change log can bring up to date
+        self._log_floor = 0
+
+    @property
+    def version(self) -> int:
+        return self._snapshot.version if self._snapshot else 0
+
+    @property
+    def is_stale(self) -> bool:
+        return self._built < self._requested
+
+    def version_tag(self, version: int) -> str:
+        """"<epoch>-<version>": only versions from the same epoch can be compared"""
+        return f"{self.epoch}-{version}"
+
+    async def get_snapshot(self) -> CatalogSnapshot:
+        """Return the current snapshot, building it on first use"""
+        while self._snapshot is None:
+            await self.flight.do("rebuild", self._rebuild_pending)
+
+        age = time.monotonic() - self._validated_at
+        if not self.is_stale and age > self.max_staleness:
+            # Catch edits made outside AdminService; an unchanged menu keeps its version
+            self._request_rebuild(None)
+
+        if self.is_stale:
+            # After a failed attempt, even an expired snapshot is served as is until
+            # RETRY_DELAY passes, rather than every request waiting on a down database
+            if age > self.hard_expiry and not self._retry_pending():
+                try:
+                    await self._catch_up()
+                except Exception as e:
+                    logger.error(f"Catalog rebuild failed, serving stale snapshot v{self.version}: {e}")
+            else:
+                self._schedule_rebuild()
+
+        return self._snapshot
+
+    def invalidate(self, change: Optional[CatalogChange] = None):
+        """Mark the snapshot stale after a write and rebuild it in the background.
+
+        change lists what the write touched; without it the change log cannot
+        describe the next version and is reset.
+        """
+        self._request_rebuild(change)
+        self._schedule_rebuild()
+
+    async def refresh(self, change: Optional[CatalogChange] = None) -> CatalogSnapshot:
+        """Like invalidate, but wait until the snapshot includes the write"""
+        self._request_rebuild(change)
+        await self._catch_up()
+        return self._snapshot
+
+    def _request_rebuild(self, change: Optional[CatalogChange]):
+        self._pending_changes.append(change)
+        self._requested += 1
+
+    async def _catch_up(self):
+        # A build that started before a write committed may not include it,
+        # so keep going until every requested generation is built
+        while self._built < self._requested:
+            await self.flight.do("rebuild", self._rebuild_pending)
+
+    def _retry_pending(self) -> bool:
+        """Whether the last rebuild failed less than RETRY_DELAY seconds ago"""
+        return self._last_failure_at is not None and time.monotonic() - self._last_failure_at < self.RETRY_DELAY
+
+    def _schedule_rebuild(self):
+        if self.flight.in_flight("rebuild") or self._retry_pending():
+            return
+
+        task = asyncio.ensure_future(self._rebuild_in_background())
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    async def _rebuild_in_background(self):
+        try:
+            await self._catch_up()
+        except Exception as e:
+            logger.error(f"Catalog rebuild failed, serving stale snapshot v{self.version}: {e}")
+
+    async def _rebuild_pending(self):
+        target = self._requested
+        changes, self._pending_changes = self._pending_changes, []
+        first_build = self._snapshot is None
+
+        try:
+            changed = await self._rebuild()
+        except Exception:
+            # Let the next build pick these writes up again
+            self._pending_changes = changes + self._pending_changes
+            self._last_failure_at = time.monotonic()
+            raise
+
+        self._last_failure_at = None
+        if changed and (changes or not first_build):
+            merged: Optional[CatalogChange] = CatalogChange()
+            for change in changes:
+                merged = None if change is None or merged is None else merged.merge(change)
+            self._record_change(self._snapshot.version, merged)
+        elif not changed and changes:
+            # A write can commit while an earlier build is reading and invalidate
+            # only after it: that build already holds the rows but was logged
+            # without the write, so attach it to the version that includes it
+            self._amend_change(self._snapshot.version, [change for change in changes if change is not None])
+
+        self._built = target
+
+    def _record_change(self, version: int, change: Optional[CatalogChange]):
+        if change is None:
+            self._change_log.clear()
+            self._log_floor = version
+            return
+
+        self._change_log.append((version, change))
+        while len(self._change_log) > self._change_log_size:
+            compacted_version, _ = self._change_log.popleft()
+            self._log_floor = compacted_version
+
+    def _amend_change(self, version: int, changes: List[CatalogChange]):
+        if not changes or not self._change_log or self._change_log[-1][0] != version:
+            # Nothing logged for this version: clients at an older one already
+            # fall back to a full sync
+            return
+
+        merged = self._change_log[-1][1]
+        for change in changes:
+            merged = merged.merge(change)
+        self._change_log[-1] = (version, merged)
+
+    def changes_since(self, version: int) -> Optional[CatalogChange]:
+        """Everything changed after version, or None if the log no longer covers it"""
+        current = self.version
+        if version < self._log_floor or version > current:
+            return None
+
+        merged = CatalogChange()
+        for logged_version, change in self._change_log:
+            if logged_version > version:
+                merged = merged.merge(change)
+        return merged
+
+    def stats(self) -> dict:
+        return {
+            "version": self.version,
+            "epoch": self.epoch,
+            "stale": self.is_stale,
+            "age_seconds": round(time.monotonic() - self._validated_at, 1) if self._snapshot else None,
+            "builds": self.flight.stats()
+        }
+
+    async def _rebuild(self) -> bool:
+        """Load the catalog; swap in a new version only if its content changed"""
+        async with async_session_factory() as session:
+            products = await self._load_products(session)
+            categories = await self._load_categories(session)
+            sizes = await self._load_sizes(session)
+            prices = await self._load_prices(session)
+
+        digest = _content_digest(products, categories, sizes, prices)
+        self._validated_at = time.monotonic()
+
+        if self._snapshot is not None and self._snapshot.digest == digest:
+            logger.info(f"Catalog snapshot v{self._snapshot.version} revalidated: content unchanged")
+            return False
+
+        snapshot = self._build_snapshot(self._version + 1, products, categories, digest, sizes, prices)
+        if self._snapshot is None:
+            self._log_floor = snapshot.version
+        self._version = snapshot.version
+        self._snapshot = snapshot
+
+        logger.info(
+            f"Catalog snapshot v{snapshot.version} built: "
+            f"{len(snapshot.products)} products, {len(snapshot.categories)} categories"
+        )
+        return True
+
+    async def _load_products(self, session) -> List[ProductSchema]:
+        query = (
+            select(Product)
+            .options(
+                joinedload(Product.category),
+                # Deactivated sizes cannot be ordered, so the public menu never lists them
+                selectinload(Product.product_sizes.and_(ProductSize.is_active == True)).joinedload(ProductSize.size),
+                selectinload(Product.image_variants)
+            )
+            .where(Product.is_active == True)
+            .order_by(Product.name)
+        )
+
+        result = await session.execute(query)
+        products = result.unique().scalars().all()
+
+        categories: dict = {}
+        sizes: dict = {}
+        return [product_from_orm(product, categories, sizes) for product in products]
+
+    async def _load_categories(self, session) -> List[CategorySchema]:
+        query = (
+            select(Category)
+            .where(Category.is_active == True)
+            .order_by(Category.name)
+        )
+
+        result = await session.execute(query)
+        categories = result.scalars().all()
+
+        return [category_from_orm(category) for category in categories]
+
+    async def _load_sizes(self, session) -> List[SizeSchema]:
+        query = (
+            select(Size)
+            .where(Size.is_active == True)
+            .order_by(Size.id)
+        )
+
+        result = await session.execute(query)
+        return [size_from_orm(size) for size in result.scalars().all()]
+
+    async def _load_prices(self, session) -> Dict[int, PriceEntry]:
+        query = (
+            select(
+                ProductSize.id,
+                ProductSize.price,
+                ProductSize.is_active,
+                Product.name,
+                Product.image_path,
+                Size.name
+            )
+            .join(Product, ProductSize.product_id == Product.id)
+            .join(Size, ProductSize.size_id == Size.id)
+        )
+
+        result = await session.execute(query)
+        return {
+            product_size_id: PriceEntry(
+                product_name=product_name,
+                size_name=size_name,
+                price=price,
+                image_path=image_path,
+                is_active=bool(is_active)
+            )
+            for product_size_id, price, is_active, product_name, image_path, size_name in result.all()
+        }
+
+    @staticmethod
+    def _build_snapshot(
+        version: int,
+        products: List[ProductSchema],
+        categories: List[CategorySchema],
+        digest: str = "",
+        sizes: Iterable[SizeSchema] = (),
+        prices: Optional[Dict[int, PriceEntry]] = None
+    ) -> CatalogSnapshot:
+        by_category_name: Dict[str, List[ProductSchema]] = {}
+        by_category_slug: Dict[str, List[ProductSchema]] = {}
+        sizes_by_id = {size.id: size for size in sizes}
+
+        for product in products:
+            for ps in product.product_sizes:
+                sizes_by_id.setdefault(ps.size.id, ps.size)
+            if not product.category.is_active:
+                continue
+            by_category_name.setdefault(product.category.name, []).append(product)
+            by_category_slug.setdefault(product.category.slug, []).append(product)
+
+        return CatalogSnapshot(
+            version=version,
+            digest=digest,
+            products=tuple(products),
+            categories=tuple(categories),
+            products_by_id={product.id: product for product in products},
+            products_by_category_name={name: tuple(items) for name, items in by_category_name.items()},
+            products_by_category_slug={slug: tuple(items) for slug, items in by_category_slug.items()},
+            categories_by_slug={category.slug: category for category in categories},
+            sizes_by_id=dict(sorted(sizes_by_id.items())),
+            products_json=_embeddable_json([_product_to_dict(product) for product in products]),
+            categories_json=_embeddable_json([ALL_CATEGORY] + [
+                {"name": category.name, "slug": category.slug, "id": category.id}
+                for category in categories
+            ]),
+            search_index=SearchIndex(products),
+            suggest_trie=PrefixTrie(products, categories),
+            prices=prices or {}
+        )
+
+
+catalog_store = CatalogStore(
+    change_log_size=settings.catalog_change_log_size,
+    max_staleness=settings.catalog_max_staleness,
+    hard_expiry=settings.catalog_hard_expiry
+)
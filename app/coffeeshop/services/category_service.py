@@ -1,41 +1,24 @@
 from typing import List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_
-from sqlalchemy.orm import selectinload, joinedload
 
-from ..domain.models import Product, Category, ProductSize, Size
-from ..domain.schemas import Product as ProductSchema, Category as CategorySchema
+from ..domain.schemas import Category as CategorySchema
+from .catalog_snapshot import CatalogSnapshot, catalog_store
 
 class CategoryService:
-    """Service for category operations"""
+    """Service for category operations, served from the catalog snapshot"""
 
-    def __init__(self, db: AsyncSession):
+    def __init__(self, db: Optional[AsyncSession] = None):
         self.db = db
 
-    async def get_active_categories(self) -> List[CategorySchema]:
-        """Get all active categories"""
-        query = (
-            select(Category)
-            .where(Category.is_active == True)
-            .order_by(Category.name)
-        )
-
-        result = await self.db.execute(query)
-        categories = result.scalars().all()
+    # Every read takes an optional snapshot: a handler that already holds one
+    # (and keyed its ETag and cache entry on its version) must read from it too
 
-        return [CategorySchema.model_validate(category) for category in categories]
+    async def get_active_categories(self, snapshot: Optional[CatalogSnapshot] = None) -> List[CategorySchema]:
+        """Get all active categories"""
+        snapshot = snapshot or await catalog_store.get_snapshot()
+        return list(snapshot.categories)
 
-    async def get_category_by_slug(self, slug: str) -> Optional[CategorySchema]:
+    async def get_category_by_slug(self, slug: str, snapshot: Optional[CatalogSnapshot] = None) -> Optional[CategorySchema]:
         """Get category by slug"""
-        query = (
-            select(Category)
-            .where(Category.slug == slug)
-            .where(Category.is_active == True)
-        )
-
-        result = await self.db.execute(query)
-        category = result.scalar_one_or_none()
-
-        if category:
-            return CategorySchema.model_validate(category)
-        return None
+        snapshot = snapshot or await catalog_store.get_snapshot()
+        return snapshot.categories_by_slug.get(slug)
@@ -0,0 +1,182 @@
+# app/coffeeshop/services/image_gc.py
+"""
+Garbage collection of product image files nothing refers to any more.
+
+Replaced and removed product images (and their derivatives) stay on disk;
+this deletes the ones no Product or ProductImageVariant row references.
+Run on demand:
+    python -m app.coffeeshop.services.image_gc [--dry-run] [--grace-hours N]
+or on a schedule with IMAGE_GC_INTERVAL (seconds).
+"""
+import argparse
+import asyncio
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, Set
+
+from sqlalchemy import select
+
+from config import settings
+from ..domain.models import Product, ProductImageVariant
+from ..infrastructure.database import async_session_factory, engine
+from .image_service import PRODUCT_IMAGES_DIR, PRODUCT_IMAGES_URL, image_store
+
+logger = logging.getLogger(__name__)
+
+IMAGE_SUFFIXES = {".jpg", ".jpeg", ".png", ".gif", ".webp"}
+
+
+@dataclass
+class ImageGCReport:
+    """Outcome of one collection run"""
+
+    dry_run: bool
+    scanned: int = 0
+    referenced: int = 0
+    recent: int = 0
+    orphaned: List[str] = field(default_factory=list)
+    bytes_reclaimed: int = 0
+    errors: int = 0
+    duration: float = 0.0
+
+    def summary(self) -> str:
+        verb = "Would delete" if self.dry_run else "Deleted"
+        return (
+            f"{verb} {len(self.orphaned)} orphaned image files "
+            f"({self.bytes_reclaimed / (1024 * 1024):.1f} MB) of {self.scanned} scanned; "
+            f"{self.referenced} referenced, {self.recent} within the grace period, "
+            f"{self.errors} errors, {self.duration:.2f}s"
+        )
+
+
+async def _referenced_urls() -> Set[str]:
+    """Every image URL the database points at, including inactive products"""
+    async with async_session_factory() as db:
+        product_paths = await db.execute(select(Product.image_path).where(Product.image_path.is_not(None)))
+        variant_paths = await db.execute(select(ProductImageVariant.path, ProductImageVariant.source_path))
+
+    referenced = {path for (path,) in product_paths}
+    for path, source_path in variant_paths:
+        referenced.update((path, source_path))
+    return referenced
+
+
+def _collect(referenced: Set[str], grace_period: float, dry_run: bool, report: ImageGCReport) -> Set[str]:
+    """Walk the image directory and delete unreferenced files; returns the removed object digests"""
+    cutoff = time.time() - grace_period
+    removed_digests = set()
+
+    for dirpath, _, filenames in os.walk(PRODUCT_IMAGES_DIR):
+        for filename in filenames:
+            path = Path(dirpath) / filename
+            staged = filename.startswith(".")
+            # Dotfiles are uploads being streamed or written; only abandoned ones go
+            if not staged and path.suffix.lower() not in IMAGE_SUFFIXES:
+                continue
+
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            report.scanned += 1
+
+            url = f"{PRODUCT_IMAGES_URL}/{path.relative_to(PRODUCT_IMAGES_DIR).as_posix()}"
+            if not staged and url in referenced:
+                report.referenced += 1
+                continue
+            # Fresh files may belong to an upload whose background job has not swapped it in yet
+            if stat.st_mtime > cutoff:
+                report.recent += 1
+                continue
+
+            report.orphaned.append(url)
+            report.bytes_reclaimed += stat.st_size
+            if dry_run:
+                continue
+            try:
+                path.unlink()
+            except OSError as e:
+                report.errors += 1
+                logger.error(f"Could not delete orphaned image {path}: {e}")
+                continue
+
+            # Derivative names carry a suffix, so only originals yield a digest
+            digest = image_store.digest_from_url(url)
+            if digest is not None:
+                removed_digests.add(digest)
+
+    if not dry_run:
+        # Empty fan-out directories of the content-addressed store
+        for dirpath, dirnames, filenames in os.walk(PRODUCT_IMAGES_DIR, topdown=False):
+            if not dirnames and not filenames and Path(dirpath) != PRODUCT_IMAGES_DIR:
+                try:
+                    os.rmdir(dirpath)
+                except OSError:
+                    pass
+
+    return removed_digests
+
+
+async def collect_orphaned_images(grace_period: float = None, dry_run: bool = False) -> ImageGCReport:
+    """Delete product image files that no product or derivative row references.
+
+    Files younger than grace_period seconds are kept whatever the database
+    says. The filesystem walk runs in a worker thread.
+    """
+    if grace_period is None:
+        grace_period = settings.image_gc_grace_period
+
+    started = time.perf_counter()
+    report = ImageGCReport(dry_run=dry_run)
+    referenced = await _referenced_urls()
+
+    removed_digests = await asyncio.to_thread(_collect, referenced, grace_period, dry_run, report)
+    if removed_digests:
+        await asyncio.to_thread(image_store.forget, removed_digests)
+
+    report.duration = time.perf_counter() - started
+    logger.info(f"Image GC: {report.summary()}")
+    return report
+
+
+async def run_image_gc_periodically(interval: float):
+    """Lifespan background task: collect every interval seconds"""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await collect_orphaned_images()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Image GC failed: {e}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Delete product images no product refers to")
+    parser.add_argument("--dry-run", action="store_true", help="only report what would be deleted")
+    parser.add_argument(
+        "--grace-hours", type=float, default=settings.image_gc_grace_period / 3600,
+        help="keep files modified within this many hours (default: %(default)s)"
+    )
+    parser.add_argument("--verbose", action="store_true", help="list every orphaned file")
+    args = parser.parse_args()
+
+    async def run() -> ImageGCReport:
+        try:
+            return await collect_orphaned_images(args.grace_hours * 3600, args.dry_run)
+        finally:
+            await engine.dispose()
+
+    logging.basicConfig(level=logging.WARNING, format="%(message)s")
+    report = asyncio.run(run())
+    if args.verbose:
+        for url in report.orphaned:
+            print(url)
+    print(report.summary())
+
+
+if __name__ == "__main__":
+    main()
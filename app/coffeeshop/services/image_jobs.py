@@ -0,0 +1,50 @@
+# app/coffeeshop/services/image_jobs.py
+import logging
+
+from starlette.concurrency import run_in_threadpool
+
+from config import settings
+from ..infrastructure.database import async_session_factory
+from ..infrastructure.job_queue import Job, JobQueue, SUPERSEDED
+from .admin_service import AdminService
+from .image_service import generate_derivatives, derivative_location, image_store
+
+logger = logging.getLogger(__name__)
+
+PRODUCT_IMAGE_JOB = "product_image"
+
+image_queue = JobQueue(
+    "images",
+    max_workers=settings.image_workers,
+    max_pending=settings.image_queue_size
+)
+
+
+def submit_product_image(product_id: int, file_path: str, image_path: str) -> Job:
+    """Build derivatives for an uploaded image off the event loop, then swap it in.
+
+    The product keeps showing its previous image until the derivatives exist.
+    """
+    async def apply(job: Job, variants: list):
+        # A newer upload for the same product wins, whatever order they finish in
+        if not image_queue.is_latest(job):
+            job.status, job.progress, job.message = SUPERSEDED, 100, "Replaced by a newer upload"
+            return
+
+        await run_in_threadpool(image_store.record_derivatives, image_path, [variant["path"] for variant in variants])
+        async with async_session_factory() as db:
+            await AdminService(db).swap_product_image(product_id, image_path, variants)
+        logger.info(f"Product {product_id} image swapped to {image_path} ({len(variants)} derivatives)")
+
+    output_dir, url_prefix = derivative_location(image_path)
+    return image_queue.submit(
+        PRODUCT_IMAGE_JOB, product_id, generate_derivatives, (file_path, output_dir, url_prefix), apply
+    )
+
+
+def latest_product_image_job(product_id: int):
+    return image_queue.latest(PRODUCT_IMAGE_JOB, product_id)
+
+
+def cancel_product_image_jobs(product_id: int):
+    image_queue.forget(PRODUCT_IMAGE_JOB, product_id)
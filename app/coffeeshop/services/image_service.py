@@ -0,0 +1,129 @@
+# app/coffeeshop/services/image_service.py
+import logging
+import os
+from pathlib import Path
+from typing import List, Tuple
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # pragma: no cover - Pillow is optional at runtime
+    Image = None
+
+from config import settings
+from ..infrastructure.image_store import ImageStore
+
+logger = logging.getLogger(__name__)
+
+PRODUCT_IMAGES_DIR = Path("app/coffeeshop/static/images/products")
+PRODUCT_IMAGES_URL = "/static/images/products"
+DERIVED_DIR = PRODUCT_IMAGES_DIR / "derived"
+DERIVED_URL = f"{PRODUCT_IMAGES_URL}/derived"
+OBJECTS_DIR = PRODUCT_IMAGES_DIR / "objects"
+OBJECTS_URL = f"{PRODUCT_IMAGES_URL}/objects"
+
+image_store = ImageStore(OBJECTS_DIR, OBJECTS_URL, Path(settings.image_manifest_path))
+
+# Derivative name -> target width in pixels. Cards render at 128 CSS px,
+# the detail hero at full phone width; @2x covers retina screens.
+DERIVATIVES = (
+    ("card", 320),
+    ("card@2x", 640),
+    ("detail", 800),
+    ("detail@2x", 1600),
+)
+
+WEBP_QUALITY = 80
+JPEG_QUALITY = 82
+
+
+def image_processing_available() -> bool:
+    return Image is not None
+
+
+def derivative_location(image_path: str) -> Tuple[str, str]:
+    """Directory and URL prefix for an image's derivatives.
+
+    Content-addressed images keep theirs next to the original, named after
+    its hash, so they are immutable too; older uploads use derived/.
+    """
+    source = image_store.local_path(image_path)
+    if source is None:
+        return str(DERIVED_DIR), DERIVED_URL
+    return str(source.parent), image_path.rsplit("/", 1)[0]
+
+
+def _save_variant(image, path: Path, format: str):
+    # Write then rename: a half-written file would otherwise be reused as final
+    partial = path.with_name(f".{path.name}.partial")
+    _encode_variant(image, partial, format)
+    os.replace(partial, path)
+
+
+def _encode_variant(image, path: Path, format: str):
+    if format == "webp":
+        image.save(path, "WEBP", quality=WEBP_QUALITY, method=6)
+        return
+
+    # JPEG has no alpha channel: flatten transparent PNGs onto white
+    if image.mode in ("RGBA", "LA", "P"):
+        rgba = image.convert("RGBA")
+        background = Image.new("RGB", rgba.size, (255, 255, 255))
+        background.paste(rgba, mask=rgba.getchannel("A"))
+        image = background
+    elif image.mode != "RGB":
+        image = image.convert("RGB")
+    image.save(path, "JPEG", quality=JPEG_QUALITY, optimize=True, progressive=True)
+
+
+def generate_derivatives(source: str, output_dir: str = str(DERIVED_DIR), url_prefix: str = DERIVED_URL) -> List[dict]:
+    """Resize one uploaded image into every derivative width, as WebP and JPEG.
+
+    Plain function on paths and dicts so it can run in a worker thread or
+    process. Widths larger than the original are skipped rather than
+    upscaled (the narrowest one is always produced). Returns one dict per
+    written file, ready to store as ProductImageVariant rows.
+    """
+    if Image is None:
+        logger.warning("Pillow is not installed; serving original product images only")
+        return []
+
+    source_path = Path(source)
+    out_dir = Path(output_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    variants = []
+    with Image.open(source_path) as original:
+        # Phone photos carry their rotation in EXIF
+        image = ImageOps.exif_transpose(original)
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA" if image.mode in ("LA", "P", "PA") else "RGB")
+
+        for index, (name, width) in enumerate(DERIVATIVES):
+            if width > image.width and index > 0:
+                continue
+
+            target_width = min(width, image.width)
+            target_height = max(1, round(image.height * target_width / image.width))
+            resized = image.resize((target_width, target_height), Image.LANCZOS)
+
+            for format, extension in (("webp", "webp"), ("jpeg", "jpg")):
+                filename = f"{source_path.stem}-{name.replace('@', '_')}.{extension}"
+                path = out_dir / filename
+                # Names follow the source content, so an existing file is already right
+                # (e.g. the same photo uploaded for a second product); touch it so the
+                # orphan collector's grace period starts over
+                if path.exists():
+                    os.utime(path)
+                else:
+                    _save_variant(resized, path, format)
+
+                variants.append({
+                    "name": name,
+                    "format": format,
+                    "width": target_width,
+                    "height": target_height,
+                    "path": f"{url_prefix}/{filename}",
+                    "size_bytes": path.stat().st_size
+                })
+
+    return variants
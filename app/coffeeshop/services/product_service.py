@@ -1,122 +1,47 @@
 # app/coffeeshop/services/product_service.py
 from typing import List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_
-from sqlalchemy.orm import selectinload, joinedload
 
-from ..domain.models import Product, Category, ProductSize, Size
 from ..domain.schemas import Product as ProductSchema
+from .search_index import Suggestion
+from .catalog_snapshot import CatalogSnapshot, catalog_store
 
 
 class ProductService:
-    """Service for product operations"""
+    """Service for product operations, served from the catalog snapshot"""
 
-    def __init__(self, db: AsyncSession):
+    def __init__(self, db: Optional[AsyncSession] = None):
         self.db = db
 
-    async def get_active_products(self) -> List[ProductSchema]:
-        """Get all active products with sizes and categories"""
-        query = (
-            select(Product)
-            .options(
-                joinedload(Product.category),
-                selectinload(Product.product_sizes).joinedload(ProductSize.size)
-            )
-            .where(Product.is_active == True)
-            .order_by(Product.name)
-        )
-
-        result = await self.db.execute(query)
-        products = result.unique().scalars().all()
+    # Every read takes an optional snapshot: a handler that already holds one
+    # (and keyed its ETag and cache entry on its version) must read from it too
 
-        return [ProductSchema.model_validate(product) for product in products]
+    async def get_active_products(self, snapshot: Optional[CatalogSnapshot] = None) -> List[ProductSchema]:
+        """Get all active products with sizes and categories"""
+        snapshot = snapshot or await catalog_store.get_snapshot()
+        return list(snapshot.products)
 
-    async def get_products_by_category(self, category_name: str) -> List[ProductSchema]:
+    async def get_products_by_category(self, category_name: str, snapshot: Optional[CatalogSnapshot] = None) -> List[ProductSchema]:
         """Get products by category name"""
-        query = (
-            select(Product)
-            .options(
-                joinedload(Product.category),
-                selectinload(Product.product_sizes).joinedload(ProductSize.size)
-            )
-            .join(Category)
-            .where(
-                and_(
-                    Product.is_active == True,
-                    Category.is_active == True,
-                    Category.name == category_name
-                )
-            )
-            .order_by(Product.name)
-        )
-
-        result = await self.db.execute(query)
-        products = result.unique().scalars().all()
-
-        return [ProductSchema.model_validate(product) for product in products]
+        snapshot = snapshot or await catalog_store.get_snapshot()
+        return list(snapshot.products_by_category_name.get(category_name, ()))
 
-    async def get_products_by_category_slug(self, category_slug: str) -> List[ProductSchema]:
+    async def get_products_by_category_slug(self, category_slug: str, snapshot: Optional[CatalogSnapshot] = None) -> List[ProductSchema]:
         """Get products by category slug"""
-        query = (
-            select(Product)
-            .options(
-                joinedload(Product.category),
-                selectinload(Product.product_sizes).joinedload(ProductSize.size)
-            )
-            .join(Category)
-            .where(
-                and_(
-                    Product.is_active == True,
-                    Category.is_active == True,
-                    Category.slug == category_slug
-                )
-            )
-            .order_by(Product.name)
-        )
+        snapshot = snapshot or await catalog_store.get_snapshot()
+        return list(snapshot.products_by_category_slug.get(category_slug, ()))
 
-        result = await self.db.execute(query)
-        products = result.unique().scalars().all()
+    async def search_products(self, query: str, snapshot: Optional[CatalogSnapshot] = None) -> List[ProductSchema]:
+        """Search products by name, description and category"""
+        snapshot = snapshot or await catalog_store.get_snapshot()
+        return snapshot.search_index.search(query, limit=20)
 
-        return [ProductSchema.model_validate(product) for product in products]
+    async def suggest(self, prefix: str, limit: int = 8, snapshot: Optional[CatalogSnapshot] = None) -> List[Suggestion]:
+        """Typeahead suggestions for products and categories"""
+        snapshot = snapshot or await catalog_store.get_snapshot()
+        return snapshot.suggest_trie.suggest(prefix, limit=limit)
 
-    async def search_products(self, query: str) -> List[ProductSchema]:
-        """Search products by name"""
-        search_query = (
-            select(Product)
-            .options(
-                joinedload(Product.category),
-                selectinload(Product.product_sizes).joinedload(ProductSize.size)
-            )
-            .where(
-                and_(
-                    Product.is_active == True,
-                    Product.name.ilike(f"%{query}%")
-                )
-            )
-            .order_by(Product.name)
-            .limit(20)
-        )
-
-        result = await self.db.execute(search_query)
-        products = result.unique().scalars().all()
-
-        return [ProductSchema.model_validate(product) for product in products]
-
-    async def get_product_by_id(self, product_id: int) -> Optional[ProductSchema]:
+    async def get_product_by_id(self, product_id: int, snapshot: Optional[CatalogSnapshot] = None) -> Optional[ProductSchema]:
         """Get product by ID"""
-        query = (
-            select(Product)
-            .options(
-                joinedload(Product.category),
-                selectinload(Product.product_sizes).joinedload(ProductSize.size)
-            )
-            .where(Product.id == product_id)
-            .where(Product.is_active == True)
-        )
-
-        result = await self.db.execute(query)
-        product = result.unique().scalar_one_or_none()
-
-        if product:
-            return ProductSchema.model_validate(product)
-        return None
+        snapshot = snapshot or await catalog_store.get_snapshot()
+        return snapshot.products_by_id.get(product_id)
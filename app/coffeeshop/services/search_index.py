@@ -0,0 +1,244 @@
+# app/coffeeshop/services/search_index.py
+import re
+import unicodedata
+from bisect import bisect_left
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from ..domain.schemas import Product as ProductSchema, Category as CategorySchema
+
+CYRILLIC_TO_LATIN = {
+    "а": "a", "б": "b", "в": "v", "г": "g", "д": "d", "е": "e", "ё": "e",
+    "ж": "zh", "з": "z", "и": "i", "й": "y", "к": "k", "л": "l", "м": "m",
+    "н": "n", "о": "o", "п": "p", "р": "r", "с": "s", "т": "t", "у": "u",
+    "ф": "f", "х": "kh", "ц": "ts", "ч": "ch", "ш": "sh", "щ": "shch", "ъ": "",
+    "ы": "y", "ь": "", "э": "e", "ю": "yu", "я": "ya", "і": "i", "ї": "yi",
+    "є": "ye", "ґ": "g",
+}
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# Field weights: a hit in the name outranks one in the category or description
+FIELD_WEIGHTS = {"name": 3.0, "category": 2.0, "description": 1.0}
+
+# Match-kind multipliers, from strongest to weakest
+EXACT, PREFIX, INFIX = 3.0, 2.0, 1.0
+TRIGRAM_THRESHOLD = 0.3
+# Shorter folded tokens ("xxxx" folds to "x") share too few trigrams to compare
+MIN_FUZZY_LENGTH = 3
+
+
+def normalize(text: str) -> str:
+    """Casefold, strip accents and transliterate Cyrillic to Latin"""
+    text = unicodedata.normalize("NFKD", text.casefold())
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    return "".join(CYRILLIC_TO_LATIN.get(ch, ch) for ch in text)
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_RE.findall(normalize(text)) if text else []
+
+
+def phonetic_fold(token: str) -> str:
+    """Loose spelling fold used only for fuzzy matching (cappuccino ~ kapuchino)"""
+    token = token.replace("c", "k")
+    return re.sub(r"(.)\1+", r"\1", token)
+
+
+def trigrams(token: str) -> Set[str]:
+    padded = f"  {phonetic_fold(token)} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class SearchIndex:
+    """In-memory inverted and trigram index over product name, description and category"""
+
+    def __init__(self, products: Iterable[ProductSchema]):
+        self._products: List[ProductSchema] = list(products)
+        self._names: List[str] = [" ".join(tokenize(product.name)) for product in self._products]
+        # token -> {product position -> best field weight}
+        self._postings: Dict[str, Dict[int, float]] = {}
+        self._trigrams: Dict[str, Set[str]] = {}
+
+        for position, product in enumerate(self._products):
+            fields = {
+                "name": product.name,
+                "category": product.category.name if product.category else "",
+                "description": product.description or "",
+            }
+            for field_name, text in fields.items():
+                weight = FIELD_WEIGHTS[field_name]
+                for token in tokenize(text):
+                    postings = self._postings.setdefault(token, {})
+                    postings[position] = max(postings.get(position, 0.0), weight)
+
+        self._tokens: List[str] = sorted(self._postings)
+        for token in self._tokens:
+            for gram in trigrams(token):
+                self._trigrams.setdefault(gram, set()).add(token)
+
+    def __len__(self) -> int:
+        return len(self._products)
+
+    def _prefix_tokens(self, prefix: str) -> Iterable[str]:
+        start = bisect_left(self._tokens, prefix)
+        for token in self._tokens[start:]:
+            if not token.startswith(prefix):
+                break
+            yield token
+
+    def _candidate_tokens(self, query_token: str) -> Dict[str, float]:
+        """Index tokens matching one query token, with the strength of the match"""
+        matches: Dict[str, float] = {}
+
+        if query_token in self._postings:
+            matches[query_token] = EXACT
+
+        for token in self._prefix_tokens(query_token):
+            matches.setdefault(token, PREFIX)
+
+        if len(query_token) >= 2:
+            for token in self._tokens:
+                if token not in matches and query_token in token:
+                    matches[token] = INFIX
+
+        if len(phonetic_fold(query_token)) >= MIN_FUZZY_LENGTH:
+            query_grams = trigrams(query_token)
+            seen: Set[str] = set()
+            for gram in query_grams:
+                seen.update(self._trigrams.get(gram, ()))
+            for token in seen - matches.keys():
+                grams = trigrams(token)
+                similarity = len(query_grams & grams) / len(query_grams | grams)
+                if similarity >= TRIGRAM_THRESHOLD:
+                    matches[token] = similarity
+
+        return matches
+
+    def search(self, query: str, limit: int = 20) -> List[ProductSchema]:
+        """Rank products matching every query token; best matches first"""
+        query_tokens = tokenize(query)
+        if not query_tokens:
+            return []
+
+        scores: Dict[int, float] = {}
+        for index, query_token in enumerate(query_tokens):
+            token_scores: Dict[int, float] = {}
+            for token, strength in self._candidate_tokens(query_token).items():
+                for position, weight in self._postings[token].items():
+                    token_scores[position] = max(token_scores.get(position, 0.0), strength * weight)
+
+            if index == 0:
+                scores = token_scores
+            else:
+                scores = {
+                    position: score + token_scores[position]
+                    for position, score in scores.items()
+                    if position in token_scores
+                }
+
+            if not scores:
+                return []
+
+        # Whole-phrase hit in the name beats scattered token hits
+        phrase = " ".join(query_tokens)
+        for position in scores:
+            if phrase in self._names[position]:
+                scores[position] += EXACT * FIELD_WEIGHTS["name"]
+
+        ranked: List[Tuple[float, str, int]] = sorted(
+            (-score, self._products[position].name, position)
+            for position, score in scores.items()
+        )
+        return [self._products[position] for _, _, position in ranked[:limit]]
+
+
+@dataclass(frozen=True)
+class Suggestion:
+    """Lightweight typeahead entry for a product or a category"""
+
+    type: str
+    id: int
+    name: str
+    min_price: Optional[float]
+    slug: Optional[str] = None
+
+    def to_dict(self) -> dict:
+        data = {"type": self.type, "id": self.id, "name": self.name, "min_price": self.min_price}
+        if self.slug is not None:
+            data["slug"] = self.slug
+        return data
+
+
+class _TrieNode:
+    __slots__ = ("children", "entries")
+
+    def __init__(self):
+        self.children: Dict[str, "_TrieNode"] = {}
+        self.entries: Set[int] = set()
+
+
+class PrefixTrie:
+    """Prefix trie over product and category names for search-as-you-type"""
+
+    # Products before categories, then alphabetical
+    TYPE_RANK = {"product": 0, "category": 1}
+
+    def __init__(self, products: Iterable[ProductSchema], categories: Iterable[CategorySchema]):
+        self._root = _TrieNode()
+        self._suggestions: List[Suggestion] = []
+
+        category_prices: Dict[int, float] = {}
+        for product in products:
+            prices = [float(ps.price) for ps in product.product_sizes]
+            min_price = min(prices) if prices else None
+            if min_price is not None:
+                current = category_prices.get(product.category_id)
+                category_prices[product.category_id] = min_price if current is None else min(current, min_price)
+            self._add(Suggestion("product", product.id, product.name, min_price))
+
+        for category in categories:
+            self._add(Suggestion("category", category.id, category.name, category_prices.get(category.id), category.slug))
+
+    def _add(self, suggestion: Suggestion):
+        position = len(self._suggestions)
+        self._suggestions.append(suggestion)
+
+        # Index the whole name and every word, so "lat" finds "Caramel Latte";
+        # folded like search, so "кар" finds "Caramel" too
+        tokens = tokenize(suggestion.name)
+        keys = {phonetic_fold(token) for token in tokens}
+        keys.add(phonetic_fold("".join(tokens)))
+
+        for key in keys:
+            node = self._root
+            for ch in key:
+                node = node.children.setdefault(ch, _TrieNode())
+                node.entries.add(position)
+
+    def suggest(self, prefix: str, limit: int = 8) -> List[Suggestion]:
+        """Top suggestions whose name (or a word in it) starts with prefix"""
+        tokens = [phonetic_fold(token) for token in tokenize(prefix)]
+        if not tokens:
+            return []
+
+        # Every query word must prefix-match a word of the suggestion
+        matched: Optional[Set[int]] = None
+        for token in tokens:
+            node = self._root
+            for ch in token:
+                node = node.children.get(ch)
+                if node is None:
+                    return []
+            matched = set(node.entries) if matched is None else matched & node.entries
+            if not matched:
+                return []
+
+        ranked = sorted(
+            matched,
+            key=lambda position: (
+                self.TYPE_RANK[self._suggestions[position].type],
+                self._suggestions[position].name
+            )
+        )
+        return [self._suggestions[position] for position in ranked[:limit]]
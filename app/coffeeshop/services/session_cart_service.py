@@ -4,11 +4,8 @@ import base64
 from typing import Dict, List, Optional
 from decimal import Decimal
 from fastapi import Request, Response
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from sqlalchemy.orm import selectinload, joinedload
 
-from ..domain.models import ProductSize, Product, Size
+from .catalog_snapshot import catalog_store, PriceEntry
 from pydantic import BaseModel
 
 
@@ -39,8 +36,9 @@ class SessionCartResponse:
 
 
 class SessionCartService:
-    def __init__(self, db: AsyncSession):
-        self.db = db
+    """Cart kept in a cookie and priced from the catalog snapshot; needs no database session"""
+
+    def __init__(self):
         self.cart_cookie_name = "cart_data"
         self.max_cookie_age = 86400 * 30
 
@@ -94,6 +92,10 @@ class SessionCartService:
         except Exception:
             return {}
 
+    def has_items(self, request: Request) -> bool:
+        """Whether the cart cookie holds anything, without touching the database"""
+        return bool(self._get_cart_from_request(request))
+
     def _set_cart_cookie(self, response: Response, items: Dict[str, SessionCartItem]):
         try:
             encoded_data = self._encode_cart_data(items)
@@ -190,46 +192,30 @@ class SessionCartService:
             if not cart_items:
                 return SessionCartResponse([], Decimal('0.00'), 0)
 
-            product_size_ids = [item.product_size_id for item in cart_items.values()]
-
-            query = (
-                select(ProductSize)
-                .options(
-                    joinedload(ProductSize.product),
-                    joinedload(ProductSize.size)
-                )
-                .where(ProductSize.id.in_(product_size_ids))
-                .where(ProductSize.is_active == True)
-            )
-
-            result = await self.db.execute(query)
-            product_sizes = result.unique().scalars().all()
-
-            if not product_sizes:
-                return SessionCartResponse([], Decimal('0.00'), 0)
-
-            product_size_dict = {ps.id: ps for ps in product_sizes}
+            # Priced from the catalog snapshot: no database round trip per cart render
+            snapshot = await catalog_store.get_snapshot()
+            prices = snapshot.prices
 
             detailed_items = []
             total_amount = Decimal('0.00')
             items_count = 0
 
             for item in cart_items.values():
-                product_size = product_size_dict.get(item.product_size_id)
-                if not product_size:
+                entry = prices.get(item.product_size_id)
+                if not entry or not entry.is_active:
                     continue
 
                 try:
-                    item_total = product_size.price * item.quantity
+                    item_total = entry.price * item.quantity
 
                     detailed_item = CartItemWithDetails(
                         product_size_id=item.product_size_id,
-                        product_name=product_size.product.name,
-                        size_name=product_size.size.name,
-                        price=product_size.price,
+                        product_name=entry.product_name,
+                        size_name=entry.size_name,
+                        price=entry.price,
                         quantity=item.quantity,
                         total_price=item_total,
-                        image_path=product_size.product.image_path
+                        image_path=entry.image_path
                     )
 
                     detailed_items.append(detailed_item)
@@ -244,20 +230,11 @@ class SessionCartService:
         except Exception:
             return SessionCartResponse([], Decimal('0.00'), 0)
 
-    async def _get_product_size(self, product_size_id: int) -> Optional[ProductSize]:
+    async def _get_product_size(self, product_size_id: int) -> Optional[PriceEntry]:
         try:
-            query = (
-                select(ProductSize)
-                .options(
-                    joinedload(ProductSize.product),
-                    joinedload(ProductSize.size)
-                )
-                .where(ProductSize.id == product_size_id)
-                .where(ProductSize.is_active == True)
-            )
-
-            result = await self.db.execute(query)
-            return result.unique().scalar_one_or_none()
+            snapshot = await catalog_store.get_snapshot()
+            entry = snapshot.prices.get(product_size_id)
+            return entry if entry and entry.is_active else None
         except Exception:
             return None
 
@@ -1,121 +0,0 @@
-const CACHE_NAME = 'coffetime-v1.0.0';
-const STATIC_CACHE = 'coffetime-static-v1.0.0';
-const DYNAMIC_CACHE = 'coffetime-dynamic-v1.0.0';
-
-const STATIC_ASSETS = [
-    '/',
-    '/static/manifest.json',
-    '/static/images/icon-192.png',
-    '/static/images/icon-512.png',
-    '/static/images/apple-touch-icon.png',
-    'https://unpkg.com/htmx.org@1.9.6',
-    'https://unpkg.com/alpinejs@3.x.x/dist/cdn.min.js',
-    'https://cdn.tailwindcss.com'
-];
-
-self.addEventListener('install', (event) => {
-    event.waitUntil(
-        caches.open(STATIC_CACHE)
-            .then((cache) => {
-                return cache.addAll(STATIC_ASSETS);
-            })
-            .catch((error) => {})
-    );
-
-    self.skipWaiting();
-});
-
-self.addEventListener('activate', (event) => {
-    event.waitUntil(
-        caches.keys().then((cacheNames) => {
-            return Promise.all(
-                cacheNames.map((cacheName) => {
-                    if (cacheName !== STATIC_CACHE && cacheName !== DYNAMIC_CACHE) {
-                        return caches.delete(cacheName);
-                    }
-                })
-            );
-        })
-    );
-
-    return self.clients.claim();
-});
-
-self.addEventListener('fetch', (event) => {
-    const { request } = event;
-    const url = new URL(request.url);
-
-    if (url.pathname.startsWith('/cart/') ||
-        url.pathname.startsWith('/orders/') ||
-        url.pathname.startsWith('/admin/') ||
-        url.pathname.startsWith('/health/')) {
-        return;
-    }
-
-    event.respondWith(
-        fetch(request)
-            .then((response) => {
-                const responseClone = response.clone();
-
-                if (response.status === 200) {
-                    caches.open(DYNAMIC_CACHE).then((cache) => {
-                        cache.put(request, responseClone);
-                    });
-                }
-
-                return response;
-            })
-            .catch(() => {
-                return caches.match(request).then((cachedResponse) => {
-                    if (cachedResponse) {
-                        return cachedResponse;
-                    }
-
-                    if (request.headers.get('accept').includes('text/html')) {
-                        return caches.match('/');
-                    }
-                });
-            })
-    );
-});
-
-self.addEventListener('message', (event) => {
-    if (event.data && event.data.type === 'SKIP_WAITING') {
-        self.skipWaiting();
-    }
-
-    if (event.data && event.data.type === 'CLEAR_CACHE') {
-        event.waitUntil(
-            caches.keys().then((cacheNames) => {
-                return Promise.all(
-                    cacheNames.map((cacheName) => caches.delete(cacheName))
-                );
-            })
-        );
-    }
-});
-
-self.addEventListener('push', (event) => {
-    const options = {
-        body: event.data ? event.data.text() : 'New notification from Coffetime',
-        icon: '/static/images/icon-192.png',
-        badge: '/static/images/icon-192.png',
-        vibrate: [200, 100, 200],
-        data: {
-            dateOfArrival: Date.now(),
-            primaryKey: 1
-        }
-    };
-
-    event.waitUntil(
-        self.registration.showNotification('Coffetime', options)
-    );
-});
-
-self.addEventListener('notificationclick', (event) => {
-    event.notification.close();
-
-    event.waitUntil(
-        clients.openWindow('/')
-    );
-});
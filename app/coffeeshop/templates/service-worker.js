@@ -0,0 +1,223 @@
+// Rendered by app/coffeeshop/api/pwa.py: the version and precache list change with every deploy
+const DEPLOY_VERSION = {{ deploy_version|tojson }};
+
+const PRECACHE = `coffetime-precache-${DEPLOY_VERSION}`;
+const DYNAMIC_CACHE = `coffetime-dynamic-${DEPLOY_VERSION}`;
+// One catalog cache at a time, named after the catalog version (epoch-version) its responses show
+const CATALOG_PREFIX = `coffetime-catalog-${DEPLOY_VERSION}-`;
+const CATALOG_VERSION_HEADER = 'X-Catalog-Version';
+
+const PRECACHE_URLS = {{ precache_urls|tojson }}.concat([
+    'https://unpkg.com/htmx.org@1.9.6',
+    'https://unpkg.com/alpinejs@3.x.x/dist/cdn.min.js'
+]);
+
+// Menu pages and fragments: served from cache at once, refreshed in the background
+const CATALOG_ROUTES = ['/catalog/', '/product/', '/api/v1/catalog'];
+
+const BYPASS_ROUTES = ['/cart/', '/orders/', '/admin/', '/health'];
+
+function isCatalogRoute(url) {
+    return url.pathname === '/' || CATALOG_ROUTES.some((prefix) => url.pathname.startsWith(prefix));
+}
+
+async function catalogCacheNames() {
+    const names = await caches.keys();
+    return names.filter((name) => name.startsWith(CATALOG_PREFIX));
+}
+
+// "<epoch>-<version>": versions restart with every server process, so they
+// are only comparable within one epoch
+function parseCatalogVersion(tag) {
+    const match = /^([0-9a-f]+)-(\d+)$/.exec(tag || '');
+    return match ? { epoch: match[1], version: Number(match[2]) } : null;
+}
+
+async function openCatalogCache(tag) {
+    const names = await catalogCacheNames();
+    const current = names
+        .map((name) => parseCatalogVersion(name.slice(CATALOG_PREFIX.length)))
+        .filter(Boolean)
+        .sort((a, b) => b.version - a.version)[0];
+    const incoming = parseCatalogVersion(tag);
+
+    // Responses without a version, or from a lagging request, go to the newest cache
+    if (!incoming || (current && incoming.epoch === current.epoch && incoming.version <= current.version)) {
+        return caches.open(CATALOG_PREFIX + (current ? `${current.epoch}-${current.version}` : '0'));
+    }
+
+    // A newer version, or a restarted server: everything cached before is stale
+    await Promise.all(names.map((name) => caches.delete(name)));
+    return caches.open(CATALOG_PREFIX + `${incoming.epoch}-${incoming.version}`);
+}
+
+async function staleWhileRevalidate(event) {
+    const { request } = event;
+    const names = await catalogCacheNames();
+    let cached;
+    for (const name of names) {
+        cached = await (await caches.open(name)).match(request);
+        if (cached) break;
+    }
+
+    const refresh = fetch(request).then(async (response) => {
+        if (response.status === 200) {
+            const cache = await openCatalogCache(response.headers.get(CATALOG_VERSION_HEADER));
+            await cache.put(request, response.clone());
+        }
+        return response;
+    });
+
+    if (cached) {
+        event.waitUntil(refresh.catch(() => {}));
+        return cached;
+    }
+    return refresh.catch(() => offlineFallback(request));
+}
+
+async function cacheFirst(request) {
+    const cached = await caches.match(request);
+    if (cached) return cached;
+
+    const response = await fetch(request);
+    if (response.status === 200) {
+        const cache = await caches.open(PRECACHE);
+        cache.put(request, response.clone());
+    }
+    return response;
+}
+
+async function networkFirst(request) {
+    try {
+        const response = await fetch(request);
+        if (response.status === 200) {
+            const cache = await caches.open(DYNAMIC_CACHE);
+            cache.put(request, response.clone());
+        }
+        return response;
+    } catch (error) {
+        const cached = await caches.match(request);
+        return cached || offlineFallback(request);
+    }
+}
+
+async function offlineFallback(request) {
+    if ((request.headers.get('accept') || '').includes('text/html')) {
+        const page = await caches.match('/');
+        if (page) return page;
+    }
+    return Response.error();
+}
+
+// The cached home page embeds the cart, so it must not outlive a cart change
+async function forgetPersonalizedPages() {
+    for (const name of await catalogCacheNames()) {
+        await (await caches.open(name)).delete('/');
+    }
+}
+
+self.addEventListener('install', (event) => {
+    event.waitUntil(
+        caches.open(PRECACHE)
+            .then((cache) => cache.addAll(PRECACHE_URLS))
+            .catch((error) => {})
+            // Warm the home page so the next visit renders from cache
+            .then(() => fetch('/'))
+            .then(async (response) => {
+                if (response.status === 200) {
+                    const cache = await openCatalogCache(response.headers.get(CATALOG_VERSION_HEADER));
+                    await cache.put('/', response);
+                }
+            })
+            .catch((error) => {})
+    );
+
+    self.skipWaiting();
+});
+
+self.addEventListener('activate', (event) => {
+    event.waitUntil(
+        caches.keys().then((cacheNames) => {
+            return Promise.all(
+                cacheNames.map((cacheName) => {
+                    // Caches from previous deploys
+                    if (cacheName !== PRECACHE && cacheName !== DYNAMIC_CACHE && !cacheName.startsWith(CATALOG_PREFIX)) {
+                        return caches.delete(cacheName);
+                    }
+                })
+            );
+        })
+    );
+
+    return self.clients.claim();
+});
+
+self.addEventListener('fetch', (event) => {
+    const { request } = event;
+    const url = new URL(request.url);
+
+    if (request.method !== 'GET') {
+        if (url.pathname.startsWith('/cart/') || url.pathname.startsWith('/orders/')) {
+            event.waitUntil(forgetPersonalizedPages());
+        }
+        return;
+    }
+
+    if (BYPASS_ROUTES.some((prefix) => url.pathname.startsWith(prefix))) {
+        return;
+    }
+
+    if (url.origin === self.location.origin && isCatalogRoute(url)) {
+        event.respondWith(staleWhileRevalidate(event));
+        return;
+    }
+
+    // Fingerprinted files never change; the CDN scripts are pinned by the precache
+    if (url.pathname.startsWith({{ static_build_url|tojson }} + '/') || PRECACHE_URLS.includes(request.url) || PRECACHE_URLS.includes(url.pathname)) {
+        event.respondWith(cacheFirst(request));
+        return;
+    }
+
+    event.respondWith(networkFirst(request));
+});
+
+self.addEventListener('message', (event) => {
+    if (event.data && event.data.type === 'SKIP_WAITING') {
+        self.skipWaiting();
+    }
+
+    if (event.data && event.data.type === 'CLEAR_CACHE') {
+        event.waitUntil(
+            caches.keys().then((cacheNames) => {
+                return Promise.all(
+                    cacheNames.map((cacheName) => caches.delete(cacheName))
+                );
+            })
+        );
+    }
+});
+
+self.addEventListener('push', (event) => {
+    const options = {
+        body: event.data ? event.data.text() : 'New notification from Coffetime',
+        icon: {{ static_url('images/icon-192.png')|tojson }},
+        badge: {{ static_url('images/icon-192.png')|tojson }},
+        vibrate: [200, 100, 200],
+        data: {
+            dateOfArrival: Date.now(),
+            primaryKey: 1
+        }
+    };
+
+    event.waitUntil(
+        self.registration.showNotification('Coffetime', options)
+    );
+});
+
+self.addEventListener('notificationclick', (event) => {
+    event.notification.close();
+
+    event.waitUntil(
+        clients.openWindow('/')
+    );
+});
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark: Pydantic model_validate vs the trusted (model_construct-style) builders
+for catalog rows, as used when the catalog snapshot is rebuilt.
+Usage: python benchmarks/bench_catalog_serialization.py [products] [sizes_per_product]
+"""
+
+import os
+import sys
+import timeit
+from datetime import datetime, timezone
+from decimal import Decimal
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.coffeeshop.domain.models import Category, Size, Product, ProductSize
+from app.coffeeshop.domain.schemas import Product as ProductSchema, product_from_orm
+
+
+def build_rows(product_count, sizes_per_product):
+    """Transient ORM rows shaped like the snapshot query result"""
+    now = datetime.now(timezone.utc)
+
+    categories = [
+        Category(id=i, name=f"Category {i}", slug=f"category-{i}", description="Category",
+                 is_active=True, created_at=now, updated_at=None)
+        for i in range(1, 6)
+    ]
+    sizes = [
+        Size(id=i, name=f"Size {i}", volume=120 * i, unit="ml", is_active=True,
+             created_at=now, updated_at=None)
+        for i in range(1, sizes_per_product + 1)
+    ]
+
+    products = []
+    for i in range(1, product_count + 1):
+        category = categories[i % len(categories)]
+        product = Product(
+            id=i, name=f"Product {i}", slug=f"product-{i}", description="A very nice coffee",
+            category_id=category.id, category=category, image_path=None, is_active=True,
+            created_at=now, updated_at=None
+        )
+        product.product_sizes = [
+            ProductSize(id=i * 10 + size.id, product_id=i, size_id=size.id, size=size,
+                        price=Decimal("3.50") + size.id, is_active=True,
+                        created_at=now, updated_at=None)
+            for size in sizes
+        ]
+        products.append(product)
+
+    return products
+
+
+def validate_all(rows):
+    return [ProductSchema.model_validate(row) for row in rows]
+
+
+def construct_all(rows):
+    categories, sizes = {}, {}
+    return [product_from_orm(row, categories, sizes) for row in rows]
+
+
+def main():
+    product_count = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    sizes_per_product = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    rows = build_rows(product_count, sizes_per_product)
+
+    # Both paths must produce the same data (also covered by tests/test_schemas.py)
+    assert [p.model_dump() for p in validate_all(rows)] == [p.model_dump() for p in construct_all(rows)]
+
+    number = 200
+    print(f"Catalog: {product_count} products x {sizes_per_product} sizes, {number} rebuilds per run")
+    print("=" * 60)
+
+    results = {}
+    for name, func in (("model_validate", validate_all), ("trusted", construct_all)):
+        best = min(timeit.repeat(lambda: func(rows), number=number, repeat=5)) / number
+        results[name] = best
+        print(f"{name:<16} {best * 1000:8.3f} ms per rebuild")
+
+    print("=" * 60)
+    print(f"Speedup: {results['model_validate'] / results['trusted']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Build fingerprinted, precompressed copies of app/coffeeshop/static for production.
+First the Tailwind CLI compiles static/css/app.css, keeping only the classes used by
+the templates and admin pages (see tailwind.config.js). Then every file is copied to STATIC_BUILD_DIR as name.<hash>.ext with .gz (and .br,
+if brotli is installed) siblings for text assets, and a staticfiles.json manifest
+that templates resolve through static_url(). Unchanged files are not rewritten.
+Usage: python build_static.py [--clean] [--skip-css]
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from config import settings
+from app.coffeeshop.infrastructure.compression import GZIP_LEVEL, MIN_COMPRESS_SIZE, brotli
+from app.coffeeshop.infrastructure.static_assets import STATIC_URL, MANIFEST_NAME, STYLESHEET
+
+SOURCE_DIR = Path("app/coffeeshop/static")
+
+TAILWIND_CONFIG = Path("tailwind.config.js")
+TAILWIND_INPUT = Path("app/coffeeshop/styles/tailwind.css")
+
+# Uploads are content-addressed already; the PWA manifest must keep a stable URL
+EXCLUDE = ("images/products/", "manifest.json")
+
+# Compressing already-compressed formats (png, jpg, webp) only wastes CPU
+COMPRESSIBLE = {".css", ".js", ".json", ".webmanifest", ".svg", ".html", ".txt", ".xml", ".ico"}
+
+# Text assets whose /static/... references are rewritten to fingerprinted URLs
+REWRITABLE = {".css", ".json", ".webmanifest"}
+STATIC_REF = re.compile(re.escape(STATIC_URL) + r"/([\w./@-]+)")
+
+HASH_LENGTH = 12
+
+# Built once per deploy, so use the slowest, smallest brotli setting
+BROTLI_BUILD_QUALITY = 11
+
+
+def source_files():
+    for path in sorted(SOURCE_DIR.rglob("*")):
+        relative = path.relative_to(SOURCE_DIR).as_posix()
+        if path.is_file() and not path.name.startswith(".") and not relative.startswith(EXCLUDE):
+            yield relative, path
+
+
+def fingerprinted_name(relative: str, content: bytes) -> str:
+    digest = hashlib.sha256(content).hexdigest()[:HASH_LENGTH]
+    stem, dot, suffix = relative.rpartition(".")
+    if not dot or "/" in suffix:
+        return f"{relative}.{digest}"
+    return f"{stem}.{digest}.{suffix}"
+
+
+def write_if_missing(path: Path, content: bytes) -> bool:
+    if path.exists():
+        return False
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.tmp")
+    tmp.write_bytes(content)
+    os.replace(tmp, path)
+    return True
+
+
+def precompress(path: Path, content: bytes) -> int:
+    """Write .gz/.br siblings where they are smaller; returns the number written"""
+    if path.suffix.lower() not in COMPRESSIBLE or len(content) < MIN_COMPRESS_SIZE:
+        return 0
+
+    written = 0
+    variants = [(".gz", lambda: gzip.compress(content, compresslevel=GZIP_LEVEL, mtime=0))]
+    if brotli is not None:
+        variants.append((".br", lambda: brotli.compress(content, quality=BROTLI_BUILD_QUALITY)))
+
+    for extension, compress in variants:
+        target = path.with_name(path.name + extension)
+        if target.exists():
+            continue
+        compressed = compress()
+        if len(compressed) < len(content):
+            written += write_if_missing(target, compressed)
+    return written
+
+
+def tailwind_command() -> list:
+    """Standalone Tailwind CLI if installed (the Docker image has it), else npx"""
+    binary = os.getenv("TAILWINDCSS_BIN") or shutil.which("tailwindcss")
+    if binary:
+        return [binary]
+    if shutil.which("npx"):
+        return ["npx", "--yes", "tailwindcss@3"]
+    return []
+
+
+def build_css() -> bool:
+    """Compile the purged, minified stylesheet; returns False if it could not be built"""
+    command = tailwind_command()
+    if not command:
+        print("Tailwind CLI not found (set TAILWINDCSS_BIN or install tailwindcss): "
+              f"{STYLESHEET} not rebuilt", file=sys.stderr)
+        return False
+
+    started = time.perf_counter()
+    output = SOURCE_DIR / STYLESHEET
+    output.parent.mkdir(parents=True, exist_ok=True)
+    result = subprocess.run(
+        command + ["--config", str(TAILWIND_CONFIG), "--input", str(TAILWIND_INPUT),
+                   "--output", str(output), "--minify"],
+        capture_output=True,
+        text=True
+    )
+    if result.returncode != 0:
+        print(f"Tailwind build failed:\n{result.stderr}", file=sys.stderr)
+        return False
+
+    print(f"Built {STYLESHEET}: {output.stat().st_size} bytes, {time.perf_counter() - started:.2f}s")
+    return True
+
+
+def build(output_dir: Path) -> dict:
+    started = time.perf_counter()
+    files = {}
+    copied = compressed = 0
+
+    # Binary files first, so text files referencing them can be rewritten
+    entries = sorted(source_files(), key=lambda item: Path(item[0]).suffix.lower() in REWRITABLE)
+    for relative, path in entries:
+        content = path.read_bytes()
+        if path.suffix.lower() in REWRITABLE:
+            text = content.decode("utf-8")
+            text = STATIC_REF.sub(
+                lambda m: f"{settings.static_build_url}/{files[m.group(1)]}" if m.group(1) in files else m.group(0),
+                text
+            )
+            content = text.encode("utf-8")
+
+        name = fingerprinted_name(relative, content)
+        files[relative] = name
+        target = output_dir / name
+        copied += write_if_missing(target, content)
+        compressed += precompress(target, content)
+
+    version = hashlib.sha256(json.dumps(files, sort_keys=True).encode()).hexdigest()[:HASH_LENGTH]
+    manifest = {"version": version, "built_at": int(time.time()), "files": files}
+
+    # Replace the manifest last and atomically: the app may be reading it
+    tmp = output_dir / f".{MANIFEST_NAME}.tmp"
+    tmp.write_text(json.dumps(manifest, indent=1, sort_keys=True), encoding="utf-8")
+    os.replace(tmp, output_dir / MANIFEST_NAME)
+
+    print(f"Static build {version}: {len(files)} files, {copied} written, "
+          f"{compressed} precompressed variants{'' if brotli else ' (gzip only: brotli not installed)'}, "
+          f"{time.perf_counter() - started:.2f}s")
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--clean", action="store_true", help="remove previous build output first")
+    parser.add_argument("--skip-css", action="store_true", help="use the existing stylesheet as is")
+    args = parser.parse_args()
+
+    # A stale stylesheet is better than none, so only fail without one
+    if not args.skip_css and not build_css() and not (SOURCE_DIR / STYLESHEET).exists():
+        sys.exit(1)
+
+    output_dir = Path(settings.static_build_dir)
+    if args.clean and output_dir.exists():
+        shutil.rmtree(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    build(output_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,6 @@
 # config.py
 import os
+import tempfile
 from pydantic_settings import BaseSettings
 
 
@@ -11,6 +12,8 @@ class Settings(BaseSettings):
     host: str = os.getenv("HOST", "127.0.0.1")
     port: int = int(os.getenv("PORT", "8000"))
     debug: bool = os.getenv("DEBUG", "False").lower() == "true"
+    # Per-section time budget (seconds) for loading data on the root page
+    page_load_timeout: float = float(os.getenv("PAGE_LOAD_TIMEOUT", "1.0"))
 
     # Security
     secret_key: str = os.getenv("SECRET_KEY", "your-secret-key-here")
@@ -25,11 +28,34 @@ class Settings(BaseSettings):
     # Files
     upload_path: str = os.getenv("UPLOAD_PATH", "./app/coffeeshop/static/images")
     max_file_size: int = int(os.getenv("MAX_FILE_SIZE", "5242880"))
+    # Fingerprinted, precompressed copies of static/ written by build_static.py
+    static_build_dir: str = os.getenv("STATIC_BUILD_DIR", "./staticfiles")
+    static_build_url: str = os.getenv("STATIC_BUILD_URL", "/staticfiles")
+    # Content-addressed product images: path, size, derivatives, created_at per object (kept out of /static)
+    image_manifest_path: str = os.getenv("IMAGE_MANIFEST_PATH", "./app/coffeeshop/image_manifest.json")
+    # Background image processing (process pool)
+    image_workers: int = int(os.getenv("IMAGE_WORKERS", "2"))
+    image_queue_size: int = int(os.getenv("IMAGE_QUEUE_SIZE", "16"))
+    # Orphaned image cleanup: files younger than the grace period are kept; interval 0 = CLI only
+    image_gc_grace_period: int = int(os.getenv("IMAGE_GC_GRACE_PERIOD", "86400"))
+    image_gc_interval: int = int(os.getenv("IMAGE_GC_INTERVAL", "0"))
 
     # Redis (for cart storage)
     redis_url: str = os.getenv("REDIS_URL", "redis://localhost:6379")
     cart_ttl: int = int(os.getenv("CART_TTL", "86400"))
 
+    # Caching
+    fragment_cache_size: int = int(os.getenv("FRAGMENT_CACHE_SIZE", "256"))
+    suggest_cache_size: int = int(os.getenv("SUGGEST_CACHE_SIZE", "1024"))
+    catalog_change_log_size: int = int(os.getenv("CATALOG_CHANGE_LOG_SIZE", "500"))
+    # Seconds before a served catalog snapshot is revalidated in the background,
+    # and after which readers wait for a rebuild instead of getting the stale one
+    catalog_max_staleness: float = float(os.getenv("CATALOG_MAX_STALENESS", "60"))
+    catalog_hard_expiry: float = float(os.getenv("CATALOG_HARD_EXPIRY", "600"))
+    template_cache_dir: str = os.getenv(
+        "TEMPLATE_CACHE_DIR", os.path.join(tempfile.gettempdir(), "coffetime-jinja")
+    )
+
     # Logging
     log_level: str = os.getenv("LOG_LEVEL", "info")
 
@@ -1,14 +1,41 @@
 #!/usr/bin/env python3
 """
 Script to generate all PWA icons and splash screens from a single source image
-Requires: pip install pillow
-Usage: python generate_icons.py source_image.png
+Requires: pip install pillow numpy  (both pinned in requirements.txt; without numpy the
+splash gradients fall back to a slower Pillow-only path)
+Usage: python generate_icons.py source_image.png [--jobs N] [--force]
+
+Outputs are generated in parallel and incrementally: a manifest next to this
+script (outside the public static tree) records what each file was built from,
+and files whose source image and parameters are unchanged are skipped.
 """
 
 from PIL import Image, ImageDraw, ImageFont
+from concurrent.futures import ProcessPoolExecutor
+import argparse
+import hashlib
+import json
 import os
 import sys
 
+try:
+    import numpy as np
+except ImportError:  # Pillow-only fallback, still without a per-row loop
+    np = None
+
+OUTPUT_DIR = "app/coffeeshop/static/images"
+MANIFEST_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".icons-manifest.json")
+
+# Bump when the drawing code changes, so every output is rebuilt
+GENERATOR_VERSION = 2
+
+# Splash screens embed this generated icon
+SPLASH_ICON = "icon-512.png"
+
+GRADIENT_TOP = (254, 215, 40)     # coffee-yellow
+GRADIENT_BOTTOM = (122, 90, 248)  # coffee-purple
+
+
 def create_icon(source_image, size, output_path, has_padding=False):
     """Create an icon of specified size"""
     img = Image.open(source_image)
@@ -28,27 +55,38 @@ def create_icon(source_image, size, output_path, has_padding=False):
         img = img.resize((size, size), Image.Resampling.LANCZOS)
 
     img.save(output_path, 'PNG', optimize=True)
-    print(f"✅ Created: {output_path}")
+    return f"✅ Created: {output_path}"
 
-def create_splash_screen(size, output_path, app_name="Coffetime"):
+
+def vertical_gradient(width, height, top=GRADIENT_TOP, bottom=GRADIENT_BOTTOM):
+    """RGB image fading from top to bottom, computed in one array operation"""
+    if np is not None:
+        t = np.arange(height, dtype=np.float64)[:, None] / height
+        column = (np.array(top) + (np.array(bottom) - np.array(top)) * t).astype(np.uint8)
+        pixels = np.ascontiguousarray(np.broadcast_to(column[:, None, :], (height, width, 3)))
+        return Image.fromarray(pixels, 'RGB')
+
+    # Один столбец пикселей, растянутый по ширине
+    column = bytes(
+        int(start + (end - start) * y / height)
+        for y in range(height)
+        for start, end in zip(top, bottom)
+    )
+    return Image.frombytes('RGB', (1, height), column).resize((width, height), Image.Resampling.NEAREST)
+
+
+def create_splash_screen(size, output_path, app_name="Coffetime", icon_path=os.path.join(OUTPUT_DIR, SPLASH_ICON)):
     """Create iOS splash screen"""
     width, height = size
 
     # Создаем фон с градиентом (coffee-yellow to coffee-purple)
-    img = Image.new('RGB', (width, height), (254, 215, 40))
+    img = vertical_gradient(width, height)
     draw = ImageDraw.Draw(img)
 
-    # Рисуем простой градиент
-    for y in range(height):
-        r = int(254 - (254 - 122) * y / height)
-        g = int(215 - (215 - 90) * y / height)
-        b = int(40 - (40 - 248) * y / height)
-        draw.line([(0, y), (width, y)], fill=(r, g, b))
-
     # Добавляем иконку в центр
     icon_size = min(width, height) // 4
     try:
-        icon = Image.open('app/coffeeshop/static/images/icon-512.png')
+        icon = Image.open(icon_path)
         icon = icon.resize((icon_size, icon_size), Image.Resampling.LANCZOS)
         icon_x = (width - icon_size) // 2
         icon_y = (height - icon_size) // 2
@@ -77,70 +115,140 @@ def create_splash_screen(size, output_path, app_name="Coffetime"):
     draw.text((text_x, text_y), app_name, fill=(255, 255, 255), font=font)
 
     img.save(output_path, 'PNG', optimize=True)
-    print(f"✅ Created splash: {output_path}")
-
-def main():
-    if len(sys.argv) < 2:
-        print("Usage: python generate_icons.py source_image.png")
-        sys.exit(1)
-
-    source_image = sys.argv[1]
-
-    if not os.path.exists(source_image):
-        print(f"❌ Error: Source image '{source_image}' not found!")
-        sys.exit(1)
-
-    output_dir = "app/coffeeshop/static/images"
-    os.makedirs(output_dir, exist_ok=True)
+    return f"✅ Created splash: {output_path}"
 
-    print("🎨 Generating PWA icons and splash screens...")
-    print("=" * 60)
 
+def icon_tasks():
+    """(filename, size, has_padding) for every icon"""
     # Standard PWA icons
-    icon_sizes = [72, 96, 128, 144, 152, 192, 384, 512]
-    for size in icon_sizes:
-        output_path = os.path.join(output_dir, f"icon-{size}.png")
-        create_icon(source_image, size, output_path, has_padding=(size >= 192))
+    for size in [72, 96, 128, 144, 152, 192, 384, 512]:
+        yield f"icon-{size}.png", size, size >= 192
 
     # Apple Touch Icons
-    apple_sizes = [57, 60, 72, 76, 114, 120, 144, 152, 180]
-    for size in apple_sizes:
-        output_path = os.path.join(output_dir, f"apple-touch-icon-{size}x{size}.png")
-        create_icon(source_image, size, output_path)
+    for size in [57, 60, 72, 76, 114, 120, 144, 152, 180]:
+        yield f"apple-touch-icon-{size}x{size}.png", size, False
 
     # Main Apple Touch Icon
-    create_icon(source_image, 180, os.path.join(output_dir, "apple-touch-icon.png"))
+    yield "apple-touch-icon.png", 180, False
 
     # Favicons
-    create_icon(source_image, 32, os.path.join(output_dir, "favicon-32x32.png"))
-    create_icon(source_image, 16, os.path.join(output_dir, "favicon-16x16.png"))
+    yield "favicon-32x32.png", 32, False
+    yield "favicon-16x16.png", 16, False
 
-    # iOS Splash Screens
-    splash_sizes = [
-        (2048, 2732, "splash-2048x2732.png"),  # iPad Pro 12.9"
-        (1668, 2388, "splash-1668x2388.png"),  # iPad Pro 11"
-        (1536, 2048, "splash-1536x2048.png"),  # iPad
-        (1242, 2688, "splash-1242x2688.png"),  # iPhone XS Max
-        (1125, 2436, "splash-1125x2436.png"),  # iPhone X/XS/11 Pro
-        (828, 1792, "splash-828x1792.png"),    # iPhone XR/11
-        (750, 1334, "splash-750x1334.png"),    # iPhone 8/7/6
-        (640, 1136, "splash-640x1136.png"),    # iPhone SE
-    ]
 
-    for width, height, filename in splash_sizes:
-        output_path = os.path.join(output_dir, filename)
-        create_splash_screen((width, height), output_path)
+def splash_tasks():
+    """(filename, width, height) for every splash screen and placeholder image"""
+    # iOS Splash Screens
+    yield "splash-2048x2732.png", 2048, 2732  # iPad Pro 12.9"
+    yield "splash-1668x2388.png", 1668, 2388  # iPad Pro 11"
+    yield "splash-1536x2048.png", 1536, 2048  # iPad
+    yield "splash-1242x2688.png", 1242, 2688  # iPhone XS Max
+    yield "splash-1125x2436.png", 1125, 2436  # iPhone X/XS/11 Pro
+    yield "splash-828x1792.png", 828, 1792    # iPhone XR/11
+    yield "splash-750x1334.png", 750, 1334    # iPhone 8/7/6
+    yield "splash-640x1136.png", 640, 1136    # iPhone SE
 
     # OG Image для социальных сетей
-    create_splash_screen((1200, 630), os.path.join(output_dir, "og-image.png"))
+    yield "og-image.png", 1200, 630
 
     # Screenshot placeholders (можно заменить на реальные скриншоты)
-    create_splash_screen((390, 844), os.path.join(output_dir, "screenshot-mobile.png"))
-    create_splash_screen((1920, 1080), os.path.join(output_dir, "screenshot-desktop.png"))
+    yield "screenshot-mobile.png", 390, 844
+    yield "screenshot-desktop.png", 1920, 1080
+
+
+def file_hash(path):
+    sha = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+def fingerprint(**inputs):
+    """Hash of everything an output depends on"""
+    inputs["generator"] = GENERATOR_VERSION
+    return hashlib.sha256(json.dumps(inputs, sort_keys=True).encode()).hexdigest()
+
+
+def load_manifest(path=MANIFEST_PATH):
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def save_manifest(manifest, path=MANIFEST_PATH):
+    with open(path + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(path + '.tmp', path)
+
+
+def run_stage(pool, jobs, output_dir, manifest, force):
+    """Run (filename, fingerprint, fn, args) jobs whose output is missing or out of date"""
+    stale = [
+        job for job in jobs
+        if force
+        or manifest.get(job[0]) != job[1]
+        or not os.path.exists(os.path.join(output_dir, job[0]))
+    ]
+    skipped = len(jobs) - len(stale)
+
+    futures = [(filename, digest, pool.submit(fn, *args)) for filename, digest, fn, args in stale]
+    for filename, digest, future in futures:
+        print(future.result())
+        manifest[filename] = digest
+    # Record progress after each stage, so an interrupted run resumes
+    save_manifest(manifest)
+    return len(stale), skipped
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate PWA icons and splash screens")
+    parser.add_argument("source_image", help="square source image, e.g. logo.png")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count(), help="parallel worker processes")
+    parser.add_argument("--force", action="store_true", help="regenerate everything")
+    args = parser.parse_args()
+
+    source_image = args.source_image
+
+    if not os.path.exists(source_image):
+        print(f"❌ Error: Source image '{source_image}' not found!")
+        sys.exit(1)
+
+    output_dir = OUTPUT_DIR
+    os.makedirs(output_dir, exist_ok=True)
+
+    print("🎨 Generating PWA icons and splash screens...")
+    print("=" * 60)
+
+    manifest = load_manifest()
+    source_hash = file_hash(source_image)
+
+    with ProcessPoolExecutor(max_workers=max(1, args.jobs)) as pool:
+        # Icons first: the splash screens embed one of them
+        icon_jobs = [
+            (filename, fingerprint(kind="icon", source=source_hash, size=size, padding=padding),
+             create_icon, (source_image, size, os.path.join(output_dir, filename), padding))
+            for filename, size, padding in icon_tasks()
+        ]
+        icons_built, icons_skipped = run_stage(pool, icon_jobs, output_dir, manifest, args.force)
+
+        icon_path = os.path.join(output_dir, SPLASH_ICON)
+        icon_hash = file_hash(icon_path) if os.path.exists(icon_path) else None
+        splash_jobs = [
+            (filename, fingerprint(kind="splash", icon=icon_hash, size=[width, height],
+                                   top=GRADIENT_TOP, bottom=GRADIENT_BOTTOM),
+             create_splash_screen, ((width, height), os.path.join(output_dir, filename)))
+            for filename, width, height in splash_tasks()
+        ]
+        splash_built, splash_skipped = run_stage(pool, splash_jobs, output_dir, manifest, args.force)
 
     print("=" * 60)
-    print("✅ All icons and splash screens generated successfully!")
+    print(f"✅ Generated {icons_built + splash_built} files, "
+          f"{icons_skipped + splash_skipped} unchanged and skipped")
     print(f"📁 Output directory: {output_dir}")
 
+
 if __name__ == "__main__":
     main()
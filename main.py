@@ -1,21 +1,27 @@
 # main.py
 import uvicorn
-import json
+import asyncio
 import logging
-from decimal import Decimal
 from fastapi import FastAPI, Request, Depends
-from fastapi.staticfiles import StaticFiles
-from fastapi.templating import Jinja2Templates
-from app.coffeeshop.infrastructure.database import get_db_session, async_session_factory
+from app.coffeeshop.infrastructure.database import get_db_session
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, StreamingResponse, Response
 from contextlib import asynccontextmanager
 
 from config import settings
-from app.coffeeshop.api import catalog, cart, orders, health
+from app.coffeeshop.api import catalog, catalog_api, cart, orders, health, pwa
 from app.coffeeshop.api.admin import router as admin_router
 from app.coffeeshop.infrastructure.database import init_db
+from app.coffeeshop.infrastructure.templating import templates, streaming_env, precompile_templates
+from app.coffeeshop.infrastructure.compression import EncodedBody
+from app.coffeeshop.infrastructure.static_files import CachingStaticFiles, PrecompressedStaticFiles
+from app.coffeeshop.infrastructure.static_assets import static_manifest
+from app.coffeeshop.api.http_cache import catalog_etag, encoded_response, revalidate
+from app.coffeeshop.api.catalog import page_cache
+from app.coffeeshop.services.catalog_snapshot import catalog_store, ALL_CATEGORIES_JSON
+from app.coffeeshop.services.image_jobs import image_queue
+from app.coffeeshop.services.image_gc import run_image_gc_periodically
 from app.coffeeshop.middleware.logging_middleware import logging_middleware
 from app.coffeeshop.middleware.error_handler import http_error_handler, general_error_handler
 from fastapi.exceptions import RequestValidationError
@@ -23,19 +29,24 @@ from starlette.exceptions import HTTPException as StarletteHTTPException
 
 logging.getLogger('sqlalchemy.engine').setLevel(logging.WARNING)
 logging.getLogger('aiosqlite').setLevel(logging.WARNING)
-
-
-class DecimalEncoder(json.JSONEncoder):
-    def default(self, obj):
-        if isinstance(obj, Decimal):
-            return float(obj)
-        return super(DecimalEncoder, self).default(obj)
+logger = logging.getLogger(__name__)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     await init_db()
+    static_manifest.load()
+    precompile_templates()
+    await catalog_store.get_snapshot()
+    image_queue.start()
+    image_gc = None
+    if settings.image_gc_interval > 0:
+        image_gc = asyncio.ensure_future(run_image_gc_periodically(settings.image_gc_interval))
     yield
+    if image_gc is not None:
+        image_gc.cancel()
+        await asyncio.gather(image_gc, return_exceptions=True)
+    await image_queue.stop()
 
 
 app = FastAPI(
@@ -60,152 +71,185 @@ app.add_exception_handler(StarletteHTTPException, http_error_handler)
 app.add_exception_handler(RequestValidationError, http_error_handler)
 app.add_exception_handler(Exception, general_error_handler)
 
-app.mount("/static", StaticFiles(directory="app/coffeeshop/static"), name="static")
+# Fingerprinted build of static/ (python build_static.py); absent in development
+app.mount(
+    settings.static_build_url,
+    PrecompressedStaticFiles(directory=settings.static_build_dir, check_dir=False),
+    name="staticfiles"
+)
+
+# Content-addressed product images never change under the same URL
+app.mount(
+    "/static",
+    CachingStaticFiles(directory="app/coffeeshop/static", immutable_paths=("images/products/objects",)),
+    name="static"
+)
 
-templates = Jinja2Templates(directory="app/coffeeshop/templates")
+STREAM_CHUNK_SIZE = 16 * 1024
 
 app.include_router(catalog.router, tags=["catalog"])
+app.include_router(catalog_api.router, prefix="/api/v1", tags=["api"])
 app.include_router(cart.router, prefix="/cart", tags=["cart"])
 app.include_router(orders.router, prefix="/orders", tags=["orders"])
 app.include_router(admin_router, prefix="/admin", tags=["admin"])
 app.include_router(health.router, prefix="/health", tags=["health"])
+app.include_router(pwa.router, tags=["pwa"])
 
 
-@app.get("/", response_class=HTMLResponse)
-async def root(request: Request, db: AsyncSession = Depends(get_db_session)):
-    products_json = []
-    all_categories = [{"name": "All", "slug": "all", "id": 0}]
-    cart_data = {"items": [], "total_amount": 0, "items_count": 0}
+EMPTY_CART = {"items": [], "total_amount": 0, "items_count": 0}
 
-    try:
-        from app.coffeeshop.services.product_service import ProductService
 
-        product_service = ProductService(db)
-        products = await product_service.get_active_products()
-
-        for product in products:
-            try:
-                product_dict = {
-                    "id": product.id,
-                    "name": product.name or "",
-                    "description": product.description or "",
-                    "image_path": product.image_path,
-                    "category": {
-                        "id": product.category.id if product.category else 0,
-                        "name": product.category.name if product.category else "Unknown",
-                        "slug": product.category.slug if product.category else "unknown"
-                    },
-                    "product_sizes": []
-                }
-
-                if hasattr(product, 'product_sizes') and product.product_sizes:
-                    for ps in product.product_sizes:
-                        if ps and ps.size:
-                            product_dict["product_sizes"].append({
-                                "id": ps.id,
-                                "price": float(ps.price),
-                                "size": {
-                                    "id": ps.size.id,
-                                    "name": ps.size.name,
-                                    "volume": ps.size.volume,
-                                    "unit": ps.size.unit
-                                }
-                            })
-
-                products_json.append(product_dict)
-
-            except Exception:
-                continue
-
-    except Exception:
-        pass
+async def load_products_json() -> str:
+    snapshot = await catalog_store.get_snapshot()
+    return snapshot.products_json
 
-    try:
-        from app.coffeeshop.services.category_service import CategoryService
 
-        category_service = CategoryService(db)
-        categories = await category_service.get_active_categories()
+async def load_categories_json() -> str:
+    snapshot = await catalog_store.get_snapshot()
+    return snapshot.categories_json
+
 
-        all_categories = [{"name": "All", "slug": "all", "id": 0}] + [
-            {"name": cat.name, "slug": cat.slug, "id": cat.id} for cat in categories
-        ]
+async def load_cart_data(request: Request) -> dict:
+    from app.coffeeshop.services.session_cart_service import SessionCartService
 
-    except Exception:
-        pass
+    cart = await SessionCartService().get_cart(request)
 
+    if not cart or not hasattr(cart, 'items_count') or cart.items_count <= 0:
+        return EMPTY_CART
+
+    cart_items_list = []
+    items = cart.items if hasattr(cart, 'items') else []
+
+    for item in items or []:
+        try:
+            cart_items_list.append({
+                "product_name": getattr(item, 'product_name', 'Unknown'),
+                "size_name": getattr(item, 'size_name', 'Unknown'),
+                "quantity": getattr(item, 'quantity', 0),
+                "price": float(getattr(item, 'price', 0)),
+                "total_price": float(getattr(item, 'total_price', 0)),
+                "product_size_id": getattr(item, 'product_size_id', 0),
+                "image_path": getattr(item, 'image_path', None)
+            })
+        except Exception:
+            continue
+
+    if not cart_items_list:
+        return EMPTY_CART
+
+    return {
+        "items": cart_items_list,
+        "total_amount": float(cart.total_amount),
+        "items_count": cart.items_count
+    }
+
+
+async def within_budget(name: str, coro, default):
+    """Await one page section; a slow or failing load degrades to its empty default"""
     try:
-        from app.coffeeshop.services.session_cart_service import SessionCartService
-
-        async with async_session_factory() as cart_db:
-            try:
-                cart_service = SessionCartService(cart_db)
-                cart = await cart_service.get_cart(request)
-
-                if cart and hasattr(cart, 'items_count'):
-                    if cart.items_count > 0:
-                        cart_items_list = []
-
-                        try:
-                            items = cart.items if hasattr(cart, 'items') else []
-
-                            if items:
-                                for item in items:
-                                    try:
-                                        cart_items_list.append({
-                                            "product_name": getattr(item, 'product_name', 'Unknown'),
-                                            "size_name": getattr(item, 'size_name', 'Unknown'),
-                                            "quantity": getattr(item, 'quantity', 0),
-                                            "price": float(getattr(item, 'price', 0)),
-                                            "total_price": float(getattr(item, 'total_price', 0)),
-                                            "product_size_id": getattr(item, 'product_size_id', 0),
-                                            "image_path": getattr(item, 'image_path', None)
-                                        })
-                                    except Exception:
-                                        continue
-
-                        except Exception:
-                            pass
-
-                        if cart_items_list:
-                            cart_data = {
-                                "items": cart_items_list,
-                                "total_amount": float(cart.total_amount),
-                                "items_count": cart.items_count
-                            }
-
-            except Exception:
-                pass
-
-    except Exception:
-        pass
+        return await asyncio.wait_for(coro, timeout=settings.page_load_timeout)
+    except asyncio.TimeoutError:
+        logger.warning(f"Root page: {name} load exceeded {settings.page_load_timeout}s, rendering it empty")
+    except Exception as e:
+        logger.error(f"Root page: {name} load failed: {e}")
+    return default
+
+
+async def stream_template(name: str, context: dict, pending: tuple = ()):
+    """Render a template with Jinja's async generator, coalescing small chunks.
+
+    Buffered output is flushed early whenever one of the pending data tasks
+    is still running, so the static shell reaches the client before the
+    template blocks on data.
+    """
+    buffer = []
+    buffered = 0
 
     try:
-        products_json_str = json.dumps(products_json, cls=DecimalEncoder, ensure_ascii=False)
-        categories_json_str = json.dumps(all_categories, ensure_ascii=False)
+        template = streaming_env.get_template(name)
+        async for chunk in template.generate_async(context):
+            buffer.append(chunk)
+            buffered += len(chunk)
 
-        response = templates.TemplateResponse(
-            "layout.html",
-            {
-                "request": request,
-                "products": products_json_str,
-                "categories": categories_json_str,
-                "cart": cart_data
-            }
-        )
+            if buffered >= STREAM_CHUNK_SIZE or any(not task.done() for task in pending):
+                yield "".join(buffer).encode("utf-8")
+                buffer = []
+                buffered = 0
 
-        return response
+        if buffer:
+            yield "".join(buffer).encode("utf-8")
 
-    except Exception:
-        return templates.TemplateResponse(
+    finally:
+        for task in pending:
+            if not task.done():
+                task.cancel()
+
+
+async def cached_root_page(request: Request) -> Response:
+    """The root page as seen with an empty cart: identical for everyone per catalog version"""
+    snapshot = await catalog_store.get_snapshot()
+    etag = catalog_etag(snapshot.version, "root")
+    # Cookie too, so shared caches never hand this to a visitor with a cart
+    vary = "Accept-Encoding, Cookie"
+
+    not_modified_response = revalidate(request, etag, vary=vary, catalog_version=catalog_store.version_tag(snapshot.version))
+    if not_modified_response is not None:
+        return not_modified_response
+
+    encoded = page_cache.get(snapshot.version, "root")
+
+    if encoded is None:
+        body = templates.get_template("layout.html").render({
+            "request": request,
+            "products": snapshot.products_json,
+            "categories": snapshot.categories_json,
+            "cart": EMPTY_CART
+        }).encode("utf-8")
+        encoded = EncodedBody.encode(body)
+        page_cache.set(snapshot.version, "root", encoded)
+
+    return encoded_response(request, encoded, etag, vary=vary, catalog_version=catalog_store.version_tag(snapshot.version))
+
+
+@app.get("/", response_class=HTMLResponse)
+async def root(request: Request):
+    from app.coffeeshop.services.session_cart_service import SessionCartService
+
+    if not SessionCartService().has_items(request):
+        try:
+            return await cached_root_page(request)
+        except Exception as e:
+            logger.error(f"Root page: cached render failed, streaming instead: {e}")
+
+    # The three sections load concurrently, each under its own time budget
+    products_task = asyncio.ensure_future(within_budget("products", load_products_json(), "[]"))
+    categories_task = asyncio.ensure_future(
+        within_budget("categories", load_categories_json(), ALL_CATEGORIES_JSON)
+    )
+    cart_task = asyncio.ensure_future(within_budget("cart", load_cart_data(request), EMPTY_CART))
+
+    async def products():
+        return await products_task
+
+    async def categories():
+        return await categories_task
+
+    async def cart():
+        return await cart_task
+
+    return StreamingResponse(
+        stream_template(
             "layout.html",
             {
                 "request": request,
-                "products": "[]",
-                "categories": '[{"name": "All", "slug": "all", "id": 0}]',
-                "cart": {"items": [], "total_amount": 0, "items_count": 0},
-                "error": "Critical error loading page"
-            }
-        )
+                "products": products,
+                "categories": categories,
+                "cart": cart
+            },
+            pending=(products_task, categories_task, cart_task)
+        ),
+        media_type="text/html; charset=utf-8"
+    )
 
 
 @app.get("/product/{product_id}", response_class=HTMLResponse)
@@ -0,0 +1,21 @@
+// tailwind.config.js
+// Used by build_static.py: only classes found in these files end up in static/css/app.css
+module.exports = {
+    content: [
+        './app/coffeeshop/templates/**/*.{html,js}',
+        // Admin pages are f-string HTML; keep their class names literal so they are found
+        './app/coffeeshop/api/admin/*.py'
+    ],
+    theme: {
+        extend: {
+            colors: {
+                'coffee-yellow': '#FED728',
+                'coffee-gray': '#E3E8EF',
+                'coffee-black': '#0D121C',
+                'coffee-purple': '#7A5AF8',
+                'coffee-purple-light': '#EBE9FE'
+            }
+        }
+    },
+    plugins: []
+}
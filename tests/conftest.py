@@ -0,0 +1,41 @@
+# tests/conftest.py
+import asyncio
+import os
+import sys
+import tempfile
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Before anything imports config: tests get their own throwaway database
+_DB_DIR = tempfile.mkdtemp(prefix="coffetime-tests-")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{os.path.join(_DB_DIR, 'test.db')}"
+
+
+def run(coro):
+    """Run a coroutine on a fresh loop, closing pooled connections bound to it"""
+    from app.coffeeshop.infrastructure.database import engine
+
+    async def runner():
+        try:
+            return await coro
+        finally:
+            await engine.dispose()
+
+    return asyncio.run(runner())
+
+
+@pytest.fixture
+def db():
+    """Empty schema for one test; yields the session factory"""
+    from app.coffeeshop.domain.models import Base
+    from app.coffeeshop.infrastructure.database import engine, async_session_factory
+
+    async def reset():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
+            await conn.run_sync(Base.metadata.create_all)
+
+    run(reset())
+    yield async_session_factory
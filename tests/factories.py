@@ -0,0 +1,43 @@
+# tests/factories.py
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import Iterable, Optional, Tuple
+
+from app.coffeeshop.domain.schemas import Category, Product, ProductSize, Size
+
+NOW = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+def make_category(id: int = 1, name: str = "Coffee", slug: Optional[str] = None) -> Category:
+    return Category(id=id, name=name, slug=slug or name.lower(), created_at=NOW)
+
+
+def make_size(id: int = 1, name: str = "Small", volume: int = 250) -> Size:
+    return Size(id=id, name=name, volume=volume, created_at=NOW)
+
+
+def make_product(
+    id: int,
+    name: str,
+    category: Optional[Category] = None,
+    sizes: Iterable[Tuple[int, Size, str, bool]] = (),
+    description: str = ""
+) -> Product:
+    """sizes: (product_size_id, size, price, is_active)"""
+    category = category or make_category()
+    return Product(
+        id=id,
+        name=name,
+        slug=name.lower().replace(" ", "-"),
+        description=description,
+        category_id=category.id,
+        category=category,
+        product_sizes=[
+            ProductSize(
+                id=product_size_id, product_id=id, size_id=size.id, size=size,
+                price=Decimal(price), is_active=is_active, created_at=NOW
+            )
+            for product_size_id, size, price, is_active in sizes
+        ],
+        created_at=NOW
+    )
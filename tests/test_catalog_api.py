@@ -0,0 +1,79 @@
+# tests/test_catalog_api.py
+import json
+from decimal import Decimal
+
+from starlette.requests import Request
+
+from app.coffeeshop.api import catalog_api
+
+from app.coffeeshop.api.catalog_api import build_catalog_document, build_changes_document
+from app.coffeeshop.domain.models import Category, Product, ProductSize, Size
+from app.coffeeshop.services.catalog_snapshot import CatalogChange, CatalogStore
+
+from .conftest import run
+from .factories import make_category, make_product, make_size
+
+
+async def seed_menu(session_factory):
+    async with session_factory() as session:
+        category = Category(name="Coffee", slug="coffee")
+        small = Size(name="Small", volume=250)
+        large = Size(name="Large", volume=450)
+        product = Product(name="Latte", slug="latte", category=category)
+        session.add_all([
+            category, small, large, product,
+            ProductSize(product=product, size=small, price=Decimal("3.50"), is_active=False),
+            ProductSize(product=product, size=large, price=Decimal("4.50"))
+        ])
+        await session.commit()
+        return product.id, large.id
+
+
+def test_deactivated_sizes_are_not_published(db):
+    product_id, large_id = run(seed_menu(db))
+    snapshot = run(CatalogStore().get_snapshot())
+
+    document = build_catalog_document(snapshot)
+    [product] = document["products"]
+    assert [size["size_id"] for size in product["sizes"]] == [large_id]
+
+    [suggestion] = snapshot.suggest_trie.suggest("lat")
+    assert suggestion.min_price == 4.5
+
+
+def test_changes_report_sizes_by_their_own_rows():
+    small, huge = make_size(1, "Small"), make_size(3, "Huge")
+    latte = make_product(1, "Latte", sizes=[(10, small, "3.50", True)])
+    snapshot = CatalogStore._build_snapshot(2, [latte], [make_category()], sizes=[small, huge])
+
+    # Size 2 was deactivated and no listed product uses it: removed.
+    # Huge was just created and nothing uses it yet: still an upsert.
+    document = build_changes_document(snapshot, 1, CatalogChange.of(sizes=[2, 3]))
+    assert [size["id"] for size in document["sizes"]] == [3]
+    assert document["removed"]["sizes"] == [2]
+
+    assert [size["id"] for size in build_catalog_document(snapshot)["sizes"]] == [1, 3]
+
+
+def get_changes(**params):
+    request = Request({"type": "http", "method": "GET", "path": "/api/v1/catalog/changes", "headers": []})
+    response = run(catalog_api.get_catalog_changes(request, **params))
+    assert response.status_code == 200
+    document = json.loads(response.body)
+    assert response.headers["X-Catalog-Version"] == f"{document['epoch']}-{document['version']}"
+    return document
+
+
+def test_changes_need_the_epoch_the_version_came_from(db, monkeypatch):
+    store = CatalogStore()
+    monkeypatch.setattr(catalog_api, "catalog_store", store)
+    run(seed_menu(db))
+    run(store.get_snapshot())
+
+    # Version 1 of this process is not version 1 of the one before it
+    assert get_changes(since=1)["full"] is True
+    assert get_changes(since=1, epoch="0" * 8)["full"] is True
+
+    document = get_changes(since=1, epoch=store.epoch)
+    assert document["full"] is False
+    assert document["epoch"] == store.epoch
@@ -0,0 +1,127 @@
+# tests/test_catalog_snapshot.py
+from app.coffeeshop.services.catalog_snapshot import CatalogChange, CatalogStore
+
+from .conftest import run
+from .factories import make_category, make_product
+
+
+class ScriptedStore(CatalogStore):
+    """CatalogStore over an in-memory menu; on_load runs once, right after the next read"""
+
+    def __init__(self):
+        super().__init__()
+        self.menu = {product_id: f"Product {product_id}" for product_id in range(1, 6)}
+        self.on_load = None
+
+    async def _load_products(self, session):
+        products = [make_product(product_id, name) for product_id, name in sorted(self.menu.items())]
+        hook, self.on_load = self.on_load, None
+        if hook:
+            hook()
+        return products
+
+    async def _load_categories(self, session):
+        return [make_category()]
+
+    async def _load_sizes(self, session):
+        return []
+
+    async def _load_prices(self, session):
+        return {}
+
+
+def test_write_invalidated_after_a_running_build_read_it_is_logged():
+    store = ScriptedStore()
+
+    async def scenario():
+        await store.get_snapshot()
+        assert store.version == 1
+
+        # Write A commits and invalidates; write B commits before the build
+        # reads the database but invalidates only after it has
+        store.menu[3] = "Edited 3"
+        store.menu[5] = "Edited 5"
+        store.on_load = lambda: store.invalidate(CatalogChange.of(products=[5]))
+        await store.refresh(CatalogChange.of(products=[3]))
+
+    run(scenario())
+
+    assert store.version == 2
+    assert store.changes_since(1).products == {3, 5}
+    assert store.changes_since(2) == CatalogChange()
+
+
+def test_unchanged_rebuild_does_not_create_a_version():
+    store = ScriptedStore()
+
+    async def scenario():
+        await store.get_snapshot()
+        await store.refresh(CatalogChange.of(products=[1]))
+
+    run(scenario())
+
+    assert store.version == 1
+    assert store.changes_since(1) == CatalogChange()
+
+
+class FailingStore(ScriptedStore):
+    """Builds once, then every database read fails"""
+
+    def __init__(self):
+        super().__init__()
+        self.attempts = 0
+        self.failing = False
+
+    async def _load_products(self, session):
+        self.attempts += 1
+        if self.failing:
+            raise ConnectionError("database unavailable")
+        return await super()._load_products(session)
+
+
+def test_expired_snapshot_backs_off_after_a_failed_rebuild():
+    store = FailingStore()
+
+    async def scenario():
+        first = await store.get_snapshot()
+        store.failing = True
+        store.invalidate(CatalogChange.of(products=[1]))
+        for task in list(store._background):
+            await task
+        attempts = store.attempts
+
+        # The background rebuild failed, and now the snapshot is past hard expiry
+        store._validated_at -= store.hard_expiry + 1
+
+        # Within RETRY_DELAY nobody waits on the database again
+        for _ in range(5):
+            assert await store.get_snapshot() is first
+        assert store.attempts == attempts
+        assert not store._background
+
+    run(scenario())
+
+
+def test_services_read_the_snapshot_they_are_given():
+    from app.coffeeshop.services.category_service import CategoryService
+    from app.coffeeshop.services.product_service import ProductService
+
+    store = ScriptedStore()
+
+    async def scenario():
+        held = await store.get_snapshot()
+        store.menu[1] = "Edited 1"
+        await store.refresh(CatalogChange.of(products=[1]))
+        assert store.version == 2
+
+        # A handler that keyed its ETag on version 1 must render version 1
+        products = await ProductService().get_active_products(snapshot=held)
+        found = await ProductService().search_products("Product 1", snapshot=held)
+        categories = await CategoryService().get_active_categories(snapshot=held)
+        return products, found, categories
+
+    products, found, categories = run(scenario())
+
+    assert products[0].name == "Product 1"
+    assert [product.id for product in found] == [1]
+    assert len(categories) == 1
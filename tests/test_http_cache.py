@@ -0,0 +1,41 @@
+# tests/test_http_cache.py
+import pytest
+from fastapi.testclient import TestClient
+
+from app.coffeeshop.api import catalog
+from main import app
+
+
+@pytest.fixture
+def client(db):
+    # No lifespan: background workers are not needed to serve fragments
+    return TestClient(app)
+
+
+@pytest.mark.parametrize("encoding", ["identity", "gzip"])
+def test_revalidation_answers_304_before_rendering(client, monkeypatch, encoding):
+    response = client.get("/catalog/categories", headers={"Accept-Encoding": encoding})
+    assert response.status_code == 200
+    etag = response.headers["ETag"]
+    assert etag.endswith('-gz"') == (encoding == "gzip")
+
+    catalog.fragment_cache.clear()
+
+    def fail(*args, **kwargs):
+        raise AssertionError("rendered a fragment for a matching If-None-Match")
+
+    monkeypatch.setattr(catalog, "render_fragment", fail)
+    revalidated = client.get("/catalog/categories", headers={"Accept-Encoding": encoding, "If-None-Match": etag})
+    assert revalidated.status_code == 304
+    assert revalidated.headers["ETag"] == etag
+
+
+def test_root_page_revalidates_before_rendering(client, monkeypatch):
+    response = client.get("/", headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+
+    catalog.page_cache.clear()
+    monkeypatch.setattr("main.templates", None)
+    revalidated = client.get("/", headers={"Accept-Encoding": "gzip", "If-None-Match": response.headers["ETag"]})
+    assert revalidated.status_code == 304
+    assert "Cookie" in revalidated.headers["Vary"]
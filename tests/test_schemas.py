@@ -0,0 +1,25 @@
+# tests/test_schemas.py
+from app.coffeeshop.domain.schemas import Product as ProductSchema, product_from_orm
+from benchmarks.bench_catalog_serialization import build_rows
+
+
+def test_trusted_construction_matches_validation():
+    rows = build_rows(product_count=6, sizes_per_product=3)
+    categories, sizes = {}, {}
+
+    validated = [ProductSchema.model_validate(row) for row in rows]
+    constructed = [product_from_orm(row, categories, sizes) for row in rows]
+
+    assert [p.model_dump() for p in constructed] == [p.model_dump() for p in validated]
+    assert all(p.model_fields_set == set(ProductSchema.model_fields) for p in constructed)
+
+
+def test_rows_sharing_a_category_share_its_read_model():
+    rows = build_rows(product_count=6, sizes_per_product=2)
+    categories, sizes = {}, {}
+    constructed = [product_from_orm(row, categories, sizes) for row in rows]
+
+    by_category = {}
+    for product in constructed:
+        by_category.setdefault(product.category_id, []).append(product.category)
+    assert all(all(c is group[0] for c in group) for group in by_category.values())
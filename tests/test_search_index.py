@@ -0,0 +1,30 @@
+# tests/test_search_index.py
+from app.coffeeshop.services.search_index import SearchIndex, PrefixTrie
+
+from .factories import make_category, make_product
+
+PRODUCTS = [
+    make_product(1, "Classic Latte X"),
+    make_product(2, "Caramel Latte"),
+    make_product(3, "Cappuccino"),
+]
+
+
+def names(products):
+    return [product.name for product in products]
+
+
+def test_fuzzy_match_tolerates_spelling():
+    assert names(SearchIndex(PRODUCTS).search("kapuchino")) == ["Cappuccino"]
+
+
+def test_repeated_letters_do_not_fold_into_a_fuzzy_match():
+    assert SearchIndex(PRODUCTS).search("x" * 500) == []
+
+
+def test_suggest_folds_c_and_k_like_search():
+    trie = PrefixTrie(PRODUCTS, [make_category()])
+    assert names(SearchIndex(PRODUCTS).search("карамел")) == ["Caramel Latte"]
+    assert [s.name for s in trie.suggest("кар")] == ["Caramel Latte"]
+    assert [s.name for s in trie.suggest("cappu")] == ["Cappuccino"]
+    assert [s.name for s in trie.suggest("lat")] == ["Caramel Latte", "Classic Latte X"]
@@ -0,0 +1,35 @@
+# tests/test_session_cart.py
+from decimal import Decimal
+
+from fastapi.testclient import TestClient
+
+from app.coffeeshop.domain.models import Category, Product, ProductSize, Size
+from app.coffeeshop.services.catalog_snapshot import catalog_store
+from main import app
+
+from .conftest import run
+
+
+async def seed_sizes(session_factory):
+    async with session_factory() as session:
+        category = Category(name="Coffee", slug="coffee")
+        product = Product(name="Flat White", slug="flat-white", category=category)
+        active = ProductSize(product=product, size=Size(name="Small", volume=250), price=Decimal("3.20"))
+        retired = ProductSize(product=product, size=Size(name="Large", volume=450), price=Decimal("4.10"), is_active=False)
+        session.add_all([category, product, active, retired])
+        await session.commit()
+        return active.id, retired.id
+
+
+def test_cart_is_priced_from_the_snapshot(db):
+    active_id, retired_id = run(seed_sizes(db))
+    run(catalog_store.refresh())
+    client = TestClient(app)
+
+    client.post("/cart/add", data={"product_size_id": active_id, "quantity": 2})
+    assert client.get("/cart/count").text.strip() == "2"
+    assert "6.40" in client.get("/cart/").text
+
+    rejected = client.post("/cart/add", data={"product_size_id": retired_id})
+    assert "Product not found" in rejected.text
+    assert client.get("/cart/count").text.strip() == "2"
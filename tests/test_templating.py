@@ -0,0 +1,10 @@
+# tests/test_templating.py
+from app.coffeeshop.infrastructure.templating import templates, precompile_templates
+
+
+def test_precompile_includes_the_service_worker():
+    templates.env.cache.clear()
+    precompile_templates()
+
+    compiled = {name for _, name in templates.env.cache.keys()}
+    assert {"layout.html", "service-worker.js"} <= compiled
@@ -0,0 +1,113 @@
+# tests/test_uploads.py
+import hashlib
+
+import pytest
+from starlette.requests import Request
+
+from app.coffeeshop.infrastructure.uploads import MAX_PARTS, SNIFF_SIZE, UploadRejected, receive_upload
+
+from .conftest import run
+
+BOUNDARY = "----coffetime-boundary"
+PNG = b"\x89PNG\r\n\x1a\n" + bytes(range(256)) * 8
+
+
+def multipart(fields=(), file=None):
+    """Body for text fields and an optional ("image", filename, bytes) file part"""
+    body = b""
+    for name, value in fields:
+        body += (
+            f"--{BOUNDARY}\r\nContent-Disposition: form-data; name=\"{name}\"\r\n\r\n"
+        ).encode() + value.encode() + b"\r\n"
+    if file is not None:
+        name, filename, data = file
+        body += (
+            f"--{BOUNDARY}\r\nContent-Disposition: form-data; name=\"{name}\"; filename=\"{filename}\"\r\n"
+            "Content-Type: application/octet-stream\r\n\r\n"
+        ).encode() + data + b"\r\n"
+    return body + f"--{BOUNDARY}--\r\n".encode()
+
+
+def receive(body, tmp_path, chunk_size=1024, max_file_size=4096):
+    """receive_upload over a chunked request stream without a Content-Length"""
+    chunks = [body[i:i + chunk_size] for i in range(0, len(body), chunk_size)] or [b""]
+    messages = [
+        {"type": "http.request", "body": chunk, "more_body": i < len(chunks) - 1}
+        for i, chunk in enumerate(chunks)
+    ]
+
+    async def receive_message():
+        return messages.pop(0)
+
+    headers = [(b"content-type", f"multipart/form-data; boundary={BOUNDARY}".encode())]
+    request = Request({"type": "http", "method": "POST", "path": "/", "headers": headers}, receive_message)
+    return run(receive_upload(request, "image", tmp_path, max_file_size))
+
+
+def test_file_is_staged_with_its_hash(tmp_path):
+    form, upload = receive(multipart([("name", "Latte")], ("image", "a.png", PNG)), tmp_path)
+
+    assert form["name"] == "Latte"
+    assert upload.extension == ".png"
+    assert upload.size == len(PNG)
+    assert upload.digest == hashlib.sha256(PNG).hexdigest()
+    assert upload.path.read_bytes() == PNG
+
+
+def test_boundary_split_across_chunks(tmp_path):
+    body = multipart([("name", "Latte")], ("image", "a.png", PNG))
+    # Chunk sizes that cut the boundary and the magic bytes at every offset
+    for chunk_size in (3, 7, len(BOUNDARY) + 1):
+        form, upload = receive(body, tmp_path, chunk_size=chunk_size)
+        assert form["name"] == "Latte"
+        assert upload.path.read_bytes() == PNG
+        upload.discard()
+
+
+def test_oversized_file_is_aborted_and_removed(tmp_path):
+    body = multipart(file=("image", "big.png", PNG + b"\0" * 4096))
+
+    with pytest.raises(UploadRejected) as rejected:
+        receive(body, tmp_path)
+
+    assert rejected.value.status_code == 413
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_bad_magic_bytes_are_rejected(tmp_path):
+    body = multipart(file=("image", "fake.png", b"<svg onload=alert(1)>" + b" " * 64))
+
+    with pytest.raises(UploadRejected) as rejected:
+        receive(body, tmp_path)
+
+    assert rejected.value.status_code == 400
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_file_shorter_than_sniff_size(tmp_path):
+    gif = b"GIF89a\x01\x00"
+    assert len(gif) < SNIFF_SIZE
+
+    _, upload = receive(multipart(file=("image", "tiny.gif", gif)), tmp_path)
+    assert upload.extension == ".gif"
+    assert upload.path.read_bytes() == gif
+
+    with pytest.raises(UploadRejected):
+        receive(multipart(file=("image", "tiny.png", b"tiny")), tmp_path)
+
+
+def test_empty_file_part_means_no_upload(tmp_path):
+    # What a browser sends when no file was chosen
+    form, upload = receive(multipart([("name", "Latte")], ("image", "", b"")), tmp_path)
+
+    assert form["name"] == "Latte"
+    assert upload is None
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_field_count_is_capped_without_content_length(tmp_path):
+    body = multipart([(f"field{i}", "x") for i in range(MAX_PARTS + 1)])
+
+    with pytest.raises(UploadRejected) as rejected:
+        receive(body, tmp_path)
+    assert rejected.value.status_code == 413